@@ -5,8 +5,11 @@ Main application with HTML tip message and complete functionality
 """
 
 import streamlit as st
+from datetime import datetime
 from core.auth import check_authentication, logout, get_current_user
-from utils.feature_registry import FeatureRegistry
+from utils.feature_registry import FeatureRegistry, get_cached_handler
+from utils.helpers import run_async
+from ui.components import show_json_preview, show_markdown_report, generate_word_report_cached
 
 # Configure Streamlit page
 st.set_page_config(
@@ -103,7 +106,7 @@ Note: You can leave images/screenshot in content body
             st.error(f"❌ Feature '{feature_key}' not found")
             return
         
-        feature_handler = FeatureRegistry.get_handler(feature_key)
+        feature_handler = get_cached_handler(feature_key)
         
         if is_admin:
             render_admin_interface(feature_handler, feature_key, casino_mode)
@@ -203,7 +206,7 @@ def process_extraction_admin(feature_handler, input_data, casino_mode):
             
             if success:
                 # Save data
-                feature_handler.set_session_data('extracted_content', extracted_content)
+                feature_handler.set_extracted_content(extracted_content)
                 feature_handler.set_session_data('source_info', feature_handler.get_source_description(input_data))
                 feature_handler.set_session_data('casino_mode', casino_mode)
                 
@@ -240,9 +243,6 @@ def process_analysis_admin(feature_handler, feature_key, casino_mode):
                 return
             
             if analysis_result and analysis_result.get('success'):
-                status.update(label="Generating report...", state="running")
-                word_bytes = generate_report(analysis_result, source_info, casino_mode)
-                
                 status.update(label="✅ Analysis complete!", state="complete")
                 st.session_state['is_processing'] = False
                 
@@ -250,13 +250,16 @@ def process_analysis_admin(feature_handler, feature_key, casino_mode):
                 
                 # Show markdown report in admin interface
                 st.markdown("### 📄 Generated Report")
-                st.markdown(analysis_result['report'])
+                show_markdown_report(analysis_result['report'], key=f"admin_{feature_key}_report_view")
                 
                 # Show admin results
                 show_admin_results(analysis_result)
                 
-                # Download
-                show_download(word_bytes, f"admin_{feature_key}")
+                # Download (timestamp fixed per analysis so fragment reruns keep the same file name)
+                # The Word report is built off the script thread, only when the button is clicked
+                # (deferred download data, hence the streamlit>=1.52 requirement)
+                show_download(lambda: generate_report(analysis_result, source_info, casino_mode),
+                              f"admin_{feature_key}", datetime.now().strftime("%Y%m%d_%H%M%S"))
             else:
                 st.error("❌ Analysis failed")
                 st.session_state['is_processing'] = False
@@ -265,8 +268,9 @@ def process_analysis_admin(feature_handler, feature_key, casino_mode):
         st.error(f"❌ Analysis failed: {str(e)}")
         st.session_state['is_processing'] = False
 
+@st.fragment
 def show_admin_preview(feature_handler):
-    """Show content preview for admin"""
+    """Show content preview for admin (a fragment, so its widgets rerun only this block)"""
     extracted_content = feature_handler.get_extracted_content()
     source_info = feature_handler.get_source_info()
     
@@ -286,12 +290,7 @@ def show_admin_preview(feature_handler):
     
     # Content preview
     with st.expander("👁️ View Full Extracted Content"):
-        st.text_area(
-            "Complete Extracted Content:",
-            value=extracted_content,
-            height=400,
-            key="admin_content_preview"
-        )
+        show_json_preview(extracted_content, key="admin_content_preview")
 
 def show_admin_results(analysis_result):
     """Show analysis results for admin"""
@@ -302,50 +301,34 @@ def show_admin_results(analysis_result):
     with col1:
         st.metric("Processing Time", f"{analysis_result.get('processing_time', 0):.1f}s")
     with col2:
-        ai_response = analysis_result.get('ai_response', [])
-        violations = sum(1 for section in ai_response 
-                        if section.get('violations') != "no violation found" 
-                        and section.get('violations')) if isinstance(ai_response, list) else 0
-        st.metric("Violations Found", violations)
+        st.metric("Violations Found", analysis_result.get('violations_found', 0))
 
 def run_ai_analysis(extracted_content, casino_mode):
     """Run AI analysis"""
-    import asyncio
-    import concurrent.futures
     from core.analyzer import analyze_content
     
     try:
-        async def run_analysis():
-            return await analyze_content(extracted_content, casino_mode)
-        
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(lambda: asyncio.run(run_analysis()))
-            return future.result(timeout=300)
-            
+        return run_async(analyze_content(extracted_content, casino_mode), timeout=300)
     except Exception as e:
         st.error(f"Analysis error: {str(e)}")
         return None
 
 def generate_report(analysis_result, source_info, casino_mode):
     """Generate Word report"""
-    from core.reporter import generate_word_report
-    
-    return generate_word_report(
+    return generate_word_report_cached(
         analysis_result['report'],
         f"YMYL Report - {source_info}",
         casino_mode
     )
 
-def show_download(word_bytes, prefix: str):
-    """Show download button with unique key"""
-    from datetime import datetime
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+@st.fragment
+def show_download(report_data, prefix: str, timestamp: str):
+    """Show download button with unique key (a fragment, so clicking it doesn't rerun the page)"""
     filename = f"ymyl_report_{timestamp}.docx"
     
     st.download_button(
         label="📄 Download Report",
-        data=word_bytes,
+        data=report_data,  # Bytes, or a callable producing them on click (streamlit>=1.52)
         file_name=filename,
         mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         type="primary",
@@ -10,6 +10,7 @@ from utils.helpers import safe_log
 
 # Default settings
 DEFAULT_TIMEOUT = 30
+DEFAULT_CONNECT_TIMEOUT = 5
 DEFAULT_MAX_CONTENT_LENGTH = 1000000  # 1MB
 DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 DEFAULT_AI_TIMEOUT = 300  # 5 minutes
@@ -47,7 +48,7 @@ def get_assistant_ids() -> Dict[str, str]:
             'casino': st.secrets["casino_assistant_id"]
         }
     except KeyError as e:
-        safe_log(f"Assistant ID not found in secrets: {e}")
+        safe_log("Assistant ID not found in secrets: %s", e)
         raise KeyError(f"Assistant IDs not configured in secrets: {e}")
 
 def get_request_settings() -> Dict[str, Any]:
@@ -59,6 +60,7 @@ def get_request_settings() -> Dict[str, Any]:
     """
     return {
         'timeout': DEFAULT_TIMEOUT,
+        'connect_timeout': DEFAULT_CONNECT_TIMEOUT,
         'max_content_length': DEFAULT_MAX_CONTENT_LENGTH,
         'user_agent': DEFAULT_USER_AGENT
     }
@@ -82,7 +84,7 @@ def get_ai_settings() -> Dict[str, Any]:
             'max_content_size': DEFAULT_MAX_AI_CONTENT
         }
     except KeyError as e:
-        safe_log(f"AI settings configuration error: {e}")
+        safe_log("AI settings configuration error: %s", e)
         raise
 
 def validate_configuration() -> tuple[bool, list]:
@@ -128,7 +130,7 @@ def validate_configuration() -> tuple[bool, list]:
     if is_valid:
         safe_log("Configuration validation passed")
     else:
-        safe_log(f"Configuration validation failed: {errors}")
+        safe_log("Configuration validation failed: %s", errors)
     
     return is_valid, errors
 
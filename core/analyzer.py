@@ -5,12 +5,16 @@ Handles OpenAI Assistant API calls for YMYL compliance analysis
 """
 
 import asyncio
+import re
 import time
-import json
-from typing import Dict, Any, Optional
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 from openai import OpenAI
 from config.settings import get_ai_settings
-from utils.helpers import safe_log
+from utils.helpers import safe_log, json_loads
+
+# Marker the assistant returns for a section without violations
+NO_VIOLATIONS = "no violation found"
 
 class YMYLAnalyzer:
     """Handles AI analysis using OpenAI Assistant API"""
@@ -33,13 +37,13 @@ class YMYLAnalyzer:
             Dictionary with analysis results
         """
         try:
-            safe_log(f"Starting AI analysis (casino_mode: {casino_mode})")
+            safe_log("Starting AI analysis (casino_mode: %s)", casino_mode)
             
             # Select appropriate assistant
             assistant_id = (self.settings['casino_assistant_id'] if casino_mode 
                           else self.settings['regular_assistant_id'])
             
-            safe_log(f"Using assistant: {assistant_id}")
+            safe_log("Using assistant: %s", assistant_id)
             
             # Validate content size
             content_size = len(json_content)
@@ -63,25 +67,28 @@ class YMYLAnalyzer:
         """Process content using OpenAI Assistant API"""
         try:
             # Create thread
-            thread = self.client.beta.threads.create()
+            # Blocking client calls run in worker threads so the shared loop stays free
+            thread = await asyncio.to_thread(self.client.beta.threads.create)
             thread_id = thread.id
-            safe_log(f"Created thread: {thread_id}")
+            safe_log("Created thread: %s", thread_id)
             
             # Add message
-            self.client.beta.threads.messages.create(
+            await asyncio.to_thread(
+                self.client.beta.threads.messages.create,
                 thread_id=thread_id,
                 role="user",
                 content=content
             )
-            safe_log(f"Added content to thread ({len(content):,} characters)")
+            safe_log("Added content to thread (%d characters)", len(content))
             
             # Create and run assistant
-            run = self.client.beta.threads.runs.create(
+            run = await asyncio.to_thread(
+                self.client.beta.threads.runs.create,
                 thread_id=thread_id,
                 assistant_id=assistant_id
             )
             run_id = run.id
-            safe_log(f"Started run: {run_id}")
+            safe_log("Started run: %s", run_id)
             
             # Poll for completion
             start_time = time.time()
@@ -93,13 +100,14 @@ class YMYLAnalyzer:
                     return {'success': False, 'error': error_msg}
                 
                 await asyncio.sleep(2)  # Poll every 2 seconds
-                run = self.client.beta.threads.runs.retrieve(
+                run = await asyncio.to_thread(
+                    self.client.beta.threads.runs.retrieve,
                     thread_id=thread_id,
                     run_id=run_id
                 )
             
             processing_time = time.time() - start_time
-            safe_log(f"Analysis completed in {processing_time:.2f} seconds with status: {run.status}")
+            safe_log("Analysis completed in %.2f seconds with status: %s", processing_time, run.status)
             
             # Handle completion
             if run.status == 'completed':
@@ -122,7 +130,7 @@ class YMYLAnalyzer:
         """Extract and process AI response"""
         try:
             # Get messages
-            messages = self.client.beta.threads.messages.list(thread_id=thread_id)
+            messages = await asyncio.to_thread(self.client.beta.threads.messages.list, thread_id=thread_id)
             
             if not messages.data:
                 return {'success': False, 'error': 'No response from assistant'}
@@ -139,7 +147,7 @@ class YMYLAnalyzer:
             if not response_content or not response_content.strip():
                 return {'success': False, 'error': 'Assistant returned empty content'}
             
-            safe_log(f"Raw AI response length: {len(response_content)}")
+            safe_log("Raw AI response length: %s", len(response_content))
             
             # Parse AI response
             ai_data = self._parse_ai_response(response_content)
@@ -153,7 +161,7 @@ class YMYLAnalyzer:
             # Convert to markdown report
             markdown_report = self._convert_to_markdown(ai_data)
             
-            safe_log(f"Successfully processed AI response")
+            safe_log("Successfully processed AI response")
             
             return {
                 'success': True,
@@ -161,6 +169,7 @@ class YMYLAnalyzer:
                 'ai_response': ai_data,
                 'processing_time': processing_time,
                 'response_length': len(response_content),
+                'violations_found': self._count_violations(ai_data),
                 'thread_id': thread_id
             }
             
@@ -171,15 +180,13 @@ class YMYLAnalyzer:
 
     def _parse_ai_response(self, response_content: str) -> Optional[list]:
         """Parse JSON from AI response with multiple strategies"""
-        import re
-        
         # Strategy 1: Direct JSON parsing
         try:
-            ai_data = json.loads(response_content.strip())
+            ai_data = json_loads(response_content.strip())
             if isinstance(ai_data, list) and self._validate_response_structure(ai_data):
                 safe_log("Successfully parsed as direct JSON array")
                 return ai_data
-        except json.JSONDecodeError:
+        except ValueError:
             pass
         
         # Strategy 2: Extract JSON array from text
@@ -188,11 +195,11 @@ class YMYLAnalyzer:
         
         for match in json_matches:
             try:
-                ai_data = json.loads(match)
+                ai_data = json_loads(match)
                 if isinstance(ai_data, list) and self._validate_response_structure(ai_data):
                     safe_log("Successfully extracted JSON array from text")
                     return ai_data
-            except json.JSONDecodeError:
+            except ValueError:
                 continue
         
         # Strategy 3: Extract from code blocks
@@ -201,16 +208,22 @@ class YMYLAnalyzer:
         
         for match in code_matches:
             try:
-                ai_data = json.loads(match)
+                ai_data = json_loads(match)
                 if isinstance(ai_data, list) and self._validate_response_structure(ai_data):
                     safe_log("Successfully extracted JSON array from code block")
                     return ai_data
-            except json.JSONDecodeError:
+            except ValueError:
                 continue
         
         safe_log("All JSON extraction strategies failed")
         return None
 
+    def _count_violations(self, ai_data: list) -> int:
+        """Count sections that report at least one violation"""
+        # One lookup per section; violations may be a list, so no set membership test
+        return sum(1 for section in ai_data
+                   if (violations := section.get('violations')) and violations != NO_VIOLATIONS)
+
     def _validate_response_structure(self, ai_data: list) -> bool:
         """Validate AI response structure"""
         if not isinstance(ai_data, list) or len(ai_data) == 0:
@@ -246,7 +259,7 @@ class YMYLAnalyzer:
             return False
         
         violations = item.get('violations')
-        if not (violations == "no violation found" or isinstance(violations, list)):
+        if not (violations == NO_VIOLATIONS or isinstance(violations, list)):
             return False
         
         return True
@@ -260,7 +273,6 @@ class YMYLAnalyzer:
             report_parts = []
             
             # Add header
-            from datetime import datetime
             report_parts.append(f"""# YMYL Compliance Audit Report
 
 **Date:** {datetime.now().strftime("%Y-%m-%d")}
@@ -281,7 +293,7 @@ class YMYLAnalyzer:
                     violations = section.get('violations', [])
                     
                     # Handle no violations
-                    if violations == "no violation found" or not violations:
+                    if violations == NO_VIOLATIONS or not violations:
                         report_parts.append(f"## {content_name}\n\n✅ **No violations found in this section.**\n\n")
                         continue
                     
@@ -342,7 +354,7 @@ class YMYLAnalyzer:
                     report_parts.append("\n")
                     
                 except Exception as e:
-                    safe_log(f"Error processing section {section.get('big_chunk_index', 'Unknown')}: {e}")
+                    safe_log("Error processing section %s: %s", section.get('big_chunk_index', 'Unknown'), e)
                     continue
             
             # Add summary
@@ -360,7 +372,7 @@ class YMYLAnalyzer:
             return ''.join(report_parts)
             
         except Exception as e:
-            safe_log(f"Error converting AI response to markdown: {e}")
+            safe_log("Error converting AI response to markdown: %s", e)
             return f"❌ **Error**: Failed to process AI response - {str(e)}"
 
 
@@ -377,4 +389,34 @@ async def analyze_content(json_content: str, casino_mode: bool = False) -> Dict[
         Dictionary with analysis results
     """
     analyzer = YMYLAnalyzer()
-    return await analyzer.analyze_content(json_content, casino_mode)
\ No newline at end of file
+    return await analyzer.analyze_content(json_content, casino_mode)
+
+
+async def analyze_content_batch(json_contents: List[str], casino_mode: bool = False,
+                                max_concurrency: int = 4) -> List[Dict[str, Any]]:
+    """
+    Analyze several documents concurrently for YMYL compliance
+    
+    Each analysis mostly waits on the assistant run, so the calls are overlapped
+    with asyncio.gather; a semaphore caps how many run at once and a single
+    analyzer (and OpenAI client) is shared between them.
+    
+    Args:
+        json_contents: Structured JSON documents to analyze
+        casino_mode: Whether to use casino-specific analysis
+        max_concurrency: Maximum number of analyses in flight
+        
+    Returns:
+        List of analysis result dictionaries, in input order
+    """
+    if not json_contents:
+        return []
+    
+    analyzer = YMYLAnalyzer()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def analyze_one(json_content: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await analyzer.analyze_content(json_content, casino_mode)
+    
+    return await asyncio.gather(*(analyze_one(content) for content in json_contents))
\ No newline at end of file
@@ -97,7 +97,7 @@ def handle_login(username: str, password: str, users: dict) -> bool:
         st.session_state.username = username
         
         st.success(f"✅ Welcome, {username}!")
-        safe_log(f"User {username} logged in successfully")
+        safe_log("User %s logged in successfully", username)
         
         time.sleep(0.5)  # Brief pause for UX
         st.rerun()
@@ -105,7 +105,7 @@ def handle_login(username: str, password: str, users: dict) -> bool:
     else:
         # Failed login
         st.error("❌ Invalid username or password")
-        safe_log(f"Failed login attempt for username: {username}")
+        safe_log("Failed login attempt for username: %s", username)
         time.sleep(1)  # Prevent rapid retry
         return False
 
@@ -118,7 +118,7 @@ def logout():
     st.session_state.authenticated = False
     st.session_state.username = None
     
-    safe_log(f"User {username} logged out")
+    safe_log("User %s logged out", username)
     st.success("👋 Logged out successfully!")
 
 def get_current_user() -> str:
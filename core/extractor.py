@@ -4,11 +4,135 @@ Content extraction module for YMYL Audit Tool
 Extracts structured content from URLs and organizes into H2-based chunks
 """
 
+import codecs
+import hashlib
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from itertools import accumulate, groupby
+from operator import itemgetter
+import lxml.html
+from lxml import etree
 from typing import Tuple, Optional, List, Dict, Any
 from config.settings import get_request_settings
-from utils.helpers import safe_log
+from utils.helpers import safe_log, json_dumps
+
+# Heading tags emitted with their own "H1:".."H6:" prefix
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+# Elements whose text is never page content
+_NON_CONTENT_TAGS = ('script', 'style', 'template')
+
+# Elements collected from the article body, in document order
+_ARTICLE_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'table', 'ul', 'ol', 'dl')
+
+
+def _class_xpath(tag: str, *classes: str) -> str:
+    """Build an XPath matching tag elements carrying any of the given classes"""
+    tests = ' or '.join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+        for cls in classes
+    )
+    return f".//{tag}[{tests}]"
+
+
+# Class-based lookups, compiled once instead of per page
+_SUBTITLE_XPATH = etree.XPath(_class_xpath('span', 'sub-title', 'd-block'))
+_LEAD_XPATH = etree.XPath(_class_xpath('p', 'lead'))
+_TAB_CONTENT_XPATH = etree.XPath(_class_xpath('div', 'tab-content'))
+
+
+def _get_text(element, separator: str = '') -> str:
+    """Join an element's stripped, non-empty text nodes (lxml get_text equivalent)"""
+    return separator.join(filter(None, (text.strip() for text in element.itertext())))
+
+
+# Bytes read per network chunk while streaming a page
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Parsers are reused per thread (lxml parsers must not be shared across threads)
+_thread_parsers = threading.local()
+
+
+def _get_parser(charset: Optional[str] = None) -> lxml.html.HTMLParser:
+    """Return this thread's HTML parser for the given charset, creating it on first use"""
+    parsers = getattr(_thread_parsers, 'by_charset', None)
+    if parsers is None:
+        parsers = _thread_parsers.by_charset = {}
+    
+    key = charset.lower() if charset else None
+    parser = parsers.get(key)
+    if parser is None:
+        parser = parsers[key] = lxml.html.HTMLParser(encoding=charset)
+    return parser
+
+
+# Recent extraction results per URL: url -> (etag, last_modified, body_digest, content)
+_extraction_cache = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+_EXTRACTION_CACHE_SIZE = 64
+
+
+def _get_cached_extraction(url: str) -> Optional[tuple]:
+    """Return the cached extraction entry for a URL, marking it recently used"""
+    with _extraction_cache_lock:
+        entry = _extraction_cache.get(url)
+        if entry is not None:
+            _extraction_cache.move_to_end(url)
+        return entry
+
+
+def _store_cached_extraction(url: str, fetch_info: Dict[str, Any], content: str):
+    """Remember an extraction result with the validators needed to revalidate it"""
+    with _extraction_cache_lock:
+        _extraction_cache[url] = (fetch_info['etag'], fetch_info['last_modified'], fetch_info['digest'], content)
+        _extraction_cache.move_to_end(url)
+        while len(_extraction_cache) > _EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+
+
+# Module-wide HTTP session, created on first use
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session(user_agent: str) -> requests.Session:
+    """
+    Return the shared requests session with pooled, retrying adapters
+    
+    Args:
+        user_agent: User-Agent header sent with every request
+        
+    Returns:
+        requests.Session reused by every ContentExtractor
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Advertise every encoding urllib3 can decode here (br/zstd when installed)
+                session.headers.update({'User-Agent': user_agent, 'Accept-Encoding': ACCEPT_ENCODING})
+                
+                # Retry transient failures on idempotent requests only
+                retry = Retry(
+                    total=3,
+                    read=False,  # Fail fast on read timeouts so the Timeout handler reports them
+                    backoff_factor=0.3,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset({'GET', 'HEAD'}),
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=20, pool_maxsize=100, max_retries=retry)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
 
 class ContentExtractor:
     """Extracts and structures content from web pages"""
@@ -17,14 +141,14 @@ class ContentExtractor:
         """Initialize the content extractor"""
         settings = get_request_settings()
         self.timeout = settings['timeout']
+        
+        # Fail fast on unreachable hosts while still allowing slow pages to stream
+        self.request_timeout = (settings['connect_timeout'], self.timeout)
         self.user_agent = settings['user_agent']
         self.max_content_length = settings['max_content_length']
         
-        # Setup session
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.user_agent
-        })
+        # Shared pooled session, so repeat fetches reuse keep-alive connections
+        self.session = _get_session(self.user_agent)
 
     def extract_content(self, url: str) -> Tuple[bool, Optional[str], Optional[str]]:
         """
@@ -37,29 +161,28 @@ class ContentExtractor:
             tuple: (success, content, error_message)
         """
         try:
-            safe_log(f"Starting content extraction from: {url}")
-            
-            # Fetch page
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            safe_log("Starting content extraction from: %s", url)
             
-            # Check content length
-            content_length = len(response.content)
-            if content_length > self.max_content_length:
-                error_msg = f"Content too large: {content_length:,} bytes (max: {self.max_content_length:,})"
+            # Fetch and parse page, revalidating any earlier result for this URL
+            cached = _get_cached_extraction(url)
+            document, error_msg, fetch_info = self._fetch_document(url, cached)
+            if error_msg:
                 safe_log(error_msg)
                 return False, None, error_msg
             
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Unchanged page (304 or identical body) - reuse the earlier result
+            if document is None:
+                safe_log("Content unchanged since last extraction: %s", url)
+                return True, cached[3], None
             
             # Extract structured content
-            content_parts = self._extract_structured_content(soup)
+            content_parts = self._extract_structured_content(document)
             
             # Organize into H2-based chunks
             organized_content = self._organize_by_h2(content_parts)
             
-            safe_log(f"Content extraction successful: {len(organized_content):,} characters")
+            _store_cached_extraction(url, fetch_info, organized_content)
+            safe_log("Content extraction successful: %d characters", len(organized_content))
             return True, organized_content, None
             
         except requests.exceptions.Timeout:
@@ -77,119 +200,259 @@ class ContentExtractor:
             safe_log(error_msg)
             return False, None, error_msg
             
+        except (etree.ParserError, etree.XMLSyntaxError):
+            # document_fromstring raises ParserError; the streaming feed parser raises XMLSyntaxError
+            error_msg = "Page contains no parseable HTML content"
+            safe_log(error_msg)
+            return False, None, error_msg
+            
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
             safe_log(error_msg)
             return False, None, error_msg
 
-    def _extract_structured_content(self, soup: BeautifulSoup) -> List[str]:
+    def _get_charset(self, response: requests.Response) -> Optional[str]:
+        """Return the charset declared in the Content-Type header, if any"""
+        content_type = response.headers.get('Content-Type', '')
+        for param in content_type.split(';')[1:]:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'charset' and value.strip():
+                return value.strip().strip('"\'')
+        return None
+
+    def _fetch_document(self, url: str, cached: Optional[tuple] = None) -> Tuple[Optional[Any], Optional[str], Dict[str, Any]]:
+        """
+        Download a page in chunks, enforcing the size limit as bytes arrive
+        
+        With a declared charset the chunks are fed straight into the parser,
+        so parsing overlaps the transfer and the raw body is never buffered.
+        
+        Args:
+            url: URL to fetch
+            cached: Earlier (etag, last_modified, body_digest, content) for this URL, if any
+            
+        Returns:
+            tuple: (document, error_message, fetch_info) - document is None on error
+            or when the page is unchanged from the cached result; fetch_info holds
+            the response's 'etag', 'last_modified' and 'digest'
+        """
+        # Conditional GET so an unchanged page costs a 304 and no body
+        headers = {}
+        if cached is not None:
+            if cached[0]:
+                headers['If-None-Match'] = cached[0]
+            if cached[1]:
+                headers['If-Modified-Since'] = cached[1]
+        
+        with self.session.get(url, timeout=self.request_timeout, stream=True, headers=headers) as response:
+            response.raise_for_status()
+            fetch_info = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'digest': None
+            }
+            if response.status_code == 304 and cached is not None:
+                return None, None, fetch_info
+            
+            # Reject oversized pages from the headers, before reading the body
+            error_msg = self._check_advertised_length(response)
+            if error_msg:
+                return None, error_msg, fetch_info
+            
+            charset = self._get_charset(response)
+            parser = None
+            if charset:
+                try:
+                    codecs.lookup(charset)
+                    parser = _get_parser(charset)
+                except LookupError:
+                    # Unknown charset - buffer the body and let _parse_html detect the encoding
+                    safe_log("Ignoring unknown charset %r for %s", charset, url)
+            body_hash = hashlib.blake2b(digest_size=16)
+            chunks = []
+            content_length = 0
+            completed = False
+            try:
+                for chunk in response.iter_content(_STREAM_CHUNK_SIZE):
+                    content_length += len(chunk)
+                    if content_length > self.max_content_length:
+                        return None, f"Content too large: {content_length:,} bytes (max: {self.max_content_length:,})", fetch_info
+                    
+                    body_hash.update(chunk)
+                    if parser is not None:
+                        parser.feed(chunk)
+                    else:
+                        chunks.append(chunk)
+                completed = True
+            finally:
+                # Aborted download: reset the reused feed parser without masking the original error
+                if not completed and parser is not None and content_length:
+                    try:
+                        parser.close()
+                    except etree.LxmlError:
+                        pass
+            
+            # Closing the feed returns the document and resets the parser for the next page
+            document = parser.close() if parser is not None and content_length else None
+        
+        # Identical body to the cached one - nothing new to extract
+        fetch_info['digest'] = body_hash.hexdigest()
+        if cached is not None and cached[2] == fetch_info['digest']:
+            return None, None, fetch_info
+        
+        # Empty body - an empty page, with no content to extract
+        if not content_length:
+            return lxml.html.document_fromstring('<html><body></body></html>'), None, fetch_info
+        
+        if parser is None:
+            return self._parse_html(b''.join(chunks)), None, fetch_info
+        
+        if document is None:
+            raise etree.ParserError("Document is empty")
+        etree.strip_elements(document, *_NON_CONTENT_TAGS, with_tail=False)
+        return document, None, fetch_info
+
+    def _parse_html(self, content: bytes, charset: Optional[str] = None):
+        """
+        Parse page bytes into an lxml document
+        
+        Args:
+            content: Raw response body
+            charset: Charset from the response headers, if declared
+            
+        Returns:
+            lxml HtmlElement for the document root
+        """
+        if charset:
+            document = lxml.html.document_fromstring(content, parser=_get_parser(charset))
+        else:
+            parser = _get_parser()
+            try:
+                # Undeclared pages are overwhelmingly UTF-8; libxml2 would
+                # otherwise assume Latin-1 when there is no <meta charset>
+                document = lxml.html.document_fromstring(content.decode('utf-8'), parser=parser)
+            except ValueError:
+                # Not UTF-8 (or carries an XML declaration) - let libxml2
+                # sniff the <meta> declaration from the raw bytes
+                document = lxml.html.document_fromstring(content, parser=parser)
+        
+        etree.strip_elements(document, *_NON_CONTENT_TAGS, with_tail=False)
+        return document
+
+    def _check_advertised_length(self, response: requests.Response) -> Optional[str]:
+        """
+        Check the Content-Length advertised in the response headers
+        
+        Args:
+            response: Streamed response whose body has not been read yet
+            
+        Returns:
+            Error message if the page is known to be too large, otherwise None
+        """
+        try:
+            content_length = int(response.headers.get('Content-Length', 0))
+        except ValueError:
+            # Header malformed - the streaming check still applies
+            return None
+        
+        if content_length > self.max_content_length:
+            return f"Content too large: {content_length:,} bytes (max: {self.max_content_length:,})"
+        return None
+
+    def _extract_structured_content(self, document) -> List[str]:
         """Extract structured content with semantic prefixes"""
         content_parts = []
         
         # Extract H1
-        h1 = soup.find('h1')
-        if h1:
-            text = h1.get_text(separator='\n', strip=True)
+        h1 = document.find('.//h1')
+        if h1 is not None:
+            text = _get_text(h1, '\n')
             if text:
                 content_parts.append(f"H1: {text}")
         
         # Extract subtitle
-        subtitle = soup.find('span', class_=['sub-title', 'd-block'])
+        subtitle = _SUBTITLE_XPATH(document)
         if subtitle:
-            text = subtitle.get_text(separator='\n', strip=True)
+            text = _get_text(subtitle[0], '\n')
             if text:
                 content_parts.append(f"SUBTITLE: {text}")
         
         # Extract lead paragraph
-        lead = soup.find('p', class_='lead')
+        lead = _LEAD_XPATH(document)
         if lead:
-            text = lead.get_text(separator='\n', strip=True)
+            text = _get_text(lead[0], '\n')
             if text:
                 content_parts.append(f"LEAD: {text}")
         
         # Extract article content
-        article = soup.find('article')
-        if article:
+        article = document.find('.//article')
+        if article is not None:
             # Remove tab-content sections
-            for tab_content in article.find_all('div', class_='tab-content'):
-                tab_content.decompose()
+            for tab_content in _TAB_CONTENT_XPATH(article):
+                tab_content.drop_tree()
             
             # Process elements in order
-            for element in article.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'table', 'ul', 'ol', 'dl']):
+            for element in article.iter(*_ARTICLE_TAGS):
                 formatted_content = self._format_element(element)
                 if formatted_content:
                     content_parts.append(formatted_content)
         
         # Extract FAQ section
-        faq_section = soup.find('section', attrs={'data-qa': 'templateFAQ'})
-        if faq_section:
-            text = faq_section.get_text(separator='\n', strip=True)
+        faq_section = document.find('.//section[@data-qa="templateFAQ"]')
+        if faq_section is not None:
+            text = _get_text(faq_section, '\n')
             if text:
                 content_parts.append(f"FAQ: {text}")
         
         # Extract author section
-        author_section = soup.find('section', attrs={'data-qa': 'templateAuthorCard'})
-        if author_section:
-            text = author_section.get_text(separator='\n', strip=True)
+        author_section = document.find('.//section[@data-qa="templateAuthorCard"]')
+        if author_section is not None:
+            text = _get_text(author_section, '\n')
             if text:
                 content_parts.append(f"AUTHOR: {text}")
         
-        # Filter empty parts
-        content_parts = [part for part in content_parts if part and part.strip()]
-        
-        safe_log(f"Extracted {len(content_parts)} content elements")
+        safe_log("Extracted %d content elements", len(content_parts))
         return content_parts
 
     def _format_element(self, element) -> Optional[str]:
         """Format individual HTML elements with appropriate prefixes"""
-        tag_name = element.name.lower()
-        text = element.get_text(separator='\n', strip=True)
-        
-        if not text:
-            return None
+        tag_name = element.tag.lower()
         
         # Handle headings
-        if tag_name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            return f"{tag_name.upper()}: {text}"
-        
-        # Handle paragraphs
-        elif tag_name == 'p':
-            element_classes = element.get('class', [])
-            if 'lead' in element_classes:
-                return f"LEAD: {text}"
-            else:
-                return f"CONTENT: {text}"
-        
-        # Handle tables
-        elif tag_name == 'table':
-            return self._format_table(element)
+        if tag_name in _HEADING_TAGS:
+            text = _get_text(element, '\n')
+            return f"{tag_name.upper()}: {text}" if text else None
         
-        # Handle lists
-        elif tag_name in ['ul', 'ol']:
-            return self._format_list(element)
-        
-        # Handle definition lists
-        elif tag_name == 'dl':
-            return self._format_definition_list(element)
+        # Dispatch everything else through the tag -> handler table
+        handler = self._ELEMENT_HANDLERS.get(tag_name)
+        return handler(self, element) if handler else None
+
+    def _format_paragraph(self, element) -> Optional[str]:
+        """Format paragraph, keeping lead paragraphs distinguishable"""
+        text = _get_text(element, '\n')
+        if not text:
+            return None
         
-        return None
+        element_classes = element.get('class', '').split()
+        if 'lead' in element_classes:
+            return f"LEAD: {text}"
+        return f"CONTENT: {text}"
 
     def _format_table(self, table) -> Optional[str]:
         """Format table with header-aware structure"""
         rows = []
         headers = []
         
-        # Try to identify headers
-        header_row = table.find('tr')
-        if header_row and header_row.find('th'):
-            headers = [th.get_text(strip=True) for th in header_row.find_all('th')]
+        # Process all rows, including nested tables, in document order
+        data_rows = list(table.iter('tr'))
         
-        # Process data rows
-        data_rows = table.find_all('tr')
+        # Try to identify headers
+        if data_rows and data_rows[0].find('.//th') is not None:
+            headers = [_get_text(th) for th in data_rows[0].iter('th')]
         start_idx = 1 if headers else 0
         
         for tr in data_rows[start_idx:]:
-            cells = [td.get_text(strip=True) for td in tr.find_all(['td', 'th'])]
+            cells = [_get_text(cell) for cell in tr.iter('td', 'th')]
             if cells and any(cell for cell in cells):
                 if headers and len(cells) == len(headers):
                     paired = [f"{h}: {v}" for h, v in zip(headers, cells) if v.strip()]
@@ -207,10 +470,10 @@ class ContentExtractor:
     def _format_list(self, list_element) -> Optional[str]:
         """Format lists with type preservation"""
         items = []
-        list_type = "ORDERED" if list_element.name == 'ol' else "UNORDERED"
+        list_type = "ORDERED" if list_element.tag == 'ol' else "UNORDERED"
         
-        for li in list_element.find_all('li', recursive=False):
-            text = li.get_text(separator=' ', strip=True)
+        for li in list_element.iterchildren('li'):
+            text = _get_text(li, ' ')
             if text:
                 items.append(text)
         
@@ -223,11 +486,11 @@ class ContentExtractor:
         definitions = []
         current_term = None
         
-        for element in dl_element.find_all(['dt', 'dd']):
-            if element.name == 'dt':
-                current_term = element.get_text(strip=True)
-            elif element.name == 'dd' and current_term:
-                definition = element.get_text(separator=' ', strip=True)
+        for element in dl_element.iter('dt', 'dd'):
+            if element.tag == 'dt':
+                current_term = _get_text(element)
+            elif element.tag == 'dd' and current_term:
+                definition = _get_text(element, ' ')
                 if definition:
                     definitions.append(f"{current_term}: {definition}")
                 current_term = None
@@ -236,6 +499,15 @@ class ContentExtractor:
             return f"DEFINITION_LIST: {' // '.join(definitions)}"
         return None
 
+    # Tag -> formatter lookup used by _format_element
+    _ELEMENT_HANDLERS = {
+        'p': _format_paragraph,
+        'table': _format_table,
+        'ul': _format_list,
+        'ol': _format_list,
+        'dl': _format_definition_list,
+    }
+
     def _organize_by_h2(self, content_parts: List[str]) -> str:
         """
         Organize content into H2-based chunks for AI processing
@@ -246,35 +518,18 @@ class ContentExtractor:
         Returns:
             JSON string formatted for AI analysis
         """
-        import json
-        
-        big_chunks = []
-        current_chunk = []
-        chunk_index = 1
-        
-        for part in content_parts:
-            # Start new chunk on H2
-            if part.startswith('H2:'):
-                # Save previous chunk if it exists
-                if current_chunk:
-                    big_chunks.append({
-                        "big_chunk_index": chunk_index,
-                        "small_chunks": current_chunk.copy()
-                    })
-                    chunk_index += 1
-                
-                # Start new chunk
-                current_chunk = [part]
-            else:
-                # Add to current chunk
-                current_chunk.append(part)
-        
-        # Add final chunk
-        if current_chunk:
-            big_chunks.append({
+        # Running H2 count as group key: every H2 opens a new group, and any
+        # content before the first H2 forms its own leading group
+        boundaries = accumulate(part.startswith('H2:') for part in content_parts)
+        big_chunks = [
+            {
                 "big_chunk_index": chunk_index,
-                "small_chunks": current_chunk
-            })
+                "small_chunks": [part for _, part in group]
+            }
+            for chunk_index, (_, group) in enumerate(
+                groupby(zip(boundaries, content_parts), key=itemgetter(0)), 1
+            )
+        ]
         
         # If no chunks created, put everything in one chunk
         if not big_chunks and content_parts:
@@ -288,8 +543,8 @@ class ContentExtractor:
             "big_chunks": big_chunks
         }
         
-        safe_log(f"Organized content into {len(big_chunks)} chunks")
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        safe_log("Organized content into %d chunks", len(big_chunks))
+        return json_dumps(result)
 
 
 def extract_url_content(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
@@ -304,3 +559,32 @@ def extract_url_content(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     extractor = ContentExtractor()
     return extractor.extract_content(url)
+
+
+def extract_urls_batch(urls: List[str], max_workers: int = 8) -> List[Tuple[bool, Optional[str], Optional[str]]]:
+    """
+    Extract content from several URLs concurrently
+    
+    Fetches are network-bound, so a small thread pool overlaps their
+    round trips; each worker thread uses its own ContentExtractor.
+    
+    Args:
+        urls: URLs to extract content from
+        max_workers: Maximum number of concurrent fetches
+        
+    Returns:
+        list: (success, organized_json_content, error_message) per URL, in input order
+    """
+    if not urls:
+        return []
+    
+    thread_state = threading.local()
+    
+    def extract_one(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
+        extractor = getattr(thread_state, 'extractor', None)
+        if extractor is None:
+            extractor = thread_state.extractor = ContentExtractor()
+        return extractor.extract_content(url)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(extract_one, urls))
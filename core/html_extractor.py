@@ -4,22 +4,67 @@ HTML Content Extractor for YMYL Audit Tool - FULLY REFACTORED VERSION
 Implements all fixes from the comprehensive plan to eliminate duplicates and improve structure
 """
 
-import json
+import logging
 import re
-from bs4 import BeautifulSoup
+import threading
+import lxml.html
+from lxml import etree
 from typing import Tuple, Optional, List, Dict, Set
-from utils.helpers import safe_log
+from utils.helpers import safe_log, json_dumps_bytes, logger
+
+# Warning banners recognised by text, fused into one alternation
+_WARN_RE = re.compile(
+    r'⚠️.*WARNING.*⚠️|ADDICTION RISK WARNING|BONUS RISK WARNING|FINANCIAL RISK WARNING',
+    re.IGNORECASE
+)
+_WARN_CLASSES = frozenset({'warning', 'risk-alert', 'disclaimer', 'alert'})
+_WARN_TEXT_TAGS = frozenset({'div', 'section', 'aside', 'p'})
+_WARNING_EXTRACT_RE = re.compile(r'⚠️[^⚠️]*WARNING[^⚠️]*⚠️')
+_WS_RE = re.compile(r'\s+')
+
+# data-qa value -> content kind for sections appended after the main walk
+_SPECIAL_SECTIONS = {
+    'templateFAQ': 'FAQ',
+    'templateAuthorCard': 'AUTHOR',
+}
+
+# Tags the document-order walk formats, in place of a find_all() pass
+_BLOCK_TAGS = frozenset({
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'table', 'ul', 'ol', 'dl', 'section', 'div'
+})
+
+# Page chrome removed before extraction
+_NOISE_TAGS = ('script', 'style', 'nav', 'footer', 'aside', 'header')
+
+# Candidate content roots, most specific first
+_MAIN_AREA_TAGS = ('article', 'main', 'body')
+
+
+def _fast_text(element) -> str:
+    """Concatenate an element's text nodes (lxml equivalent of get_text())"""
+    return ''.join(element.itertext())
+
 
 class HTMLContentExtractor:
     """Extracts structured content directly from HTML strings with comprehensive fixes"""
     
     def __init__(self):
         """Initialize HTML extractor"""
-        self.processed_elements: Set[str] = set()  # Content-based hashing
-        self.current_h2_section = None
-        self.big_chunks = []
+        # Keyed on the elements themselves: lxml proxies keep a stable
+        # identity only while referenced, so id() alone could be reused
+        self.processed_elements: Set = set()
+        self._text_cache: Dict = {}  # element -> cleaned text
+        self._reset()
         safe_log("HTMLContentExtractor initialized with comprehensive fixes")
     
+    def _reset(self):
+        """Clear per-extraction state so the instance can be reused"""
+        self.processed_elements.clear()
+        self._text_cache.clear()
+        self.big_chunks = []
+        self.current_h2_section = None
+        self._faq_emitted = False
+    
     def extract_content(self, html_content: str) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         Extract structured content from HTML string with all fixes applied
@@ -30,75 +75,95 @@ class HTMLContentExtractor:
         Returns:
             tuple: (success, organized_json_content, error_message)
         """
+        success, organized_bytes, error_msg = self.extract_content_bytes(html_content)
+        if not success:
+            return False, None, error_msg
+        return True, organized_bytes.decode('utf-8'), None
+    
+    def extract_content_bytes(self, html_content: str) -> Tuple[bool, Optional[bytes], Optional[str]]:
+        """
+        Extract structured content from HTML string as UTF-8 encoded JSON
+        
+        Args:
+            html_content: HTML content as string
+            
+        Returns:
+            tuple: (success, organized_json_bytes, error_message)
+        """
         try:
-            safe_log(f"Starting comprehensive HTML content extraction ({len(html_content):,} characters)")
+            safe_log("Starting comprehensive HTML content extraction (%d characters)", len(html_content))
             
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Parse HTML with lxml
+            document = self._parse_document(html_content)
             
             # Preprocessing: Remove noise elements
-            self._preprocess_soup(soup)
+            self._preprocess_document(document)
             
             # Reset state
-            self.processed_elements.clear()
-            self.big_chunks = []
-            self.current_h2_section = None
+            self._reset()
             
             # Extract content using direct chunking approach
-            self._extract_with_direct_chunking(soup)
+            self._extract_with_direct_chunking(document)
             
             # Create final JSON structure
-            organized_content = self._create_final_json()
+            organized_content = self._create_final_bytes()
             
-            safe_log(f"HTML extraction successful: {len(organized_content):,} characters, {len(self.big_chunks)} chunks")
+            safe_log("HTML extraction successful: %d bytes, %d chunks", len(organized_content), len(self.big_chunks))
             return True, organized_content, None
             
         except Exception as e:
             error_msg = f"HTML parsing error: {str(e)}"
             safe_log(error_msg)
             return False, None, error_msg
+        
+        finally:
+            # Drop element references so the parsed tree can be freed
+            self.processed_elements.clear()
+            self._text_cache.clear()
     
-    def _preprocess_soup(self, soup: BeautifulSoup):
+    def _parse_document(self, html_content: str):
+        """Parse an HTML string into an lxml document root"""
+        try:
+            return lxml.html.document_fromstring(html_content)
+        except ValueError:
+            # Strings carrying an XML encoding declaration must be parsed as bytes
+            parser = lxml.html.HTMLParser(encoding='utf-8')
+            return lxml.html.document_fromstring(html_content.encode('utf-8'), parser=parser)
+        except etree.ParserError:
+            # Whitespace-only input - extract from an empty document
+            return lxml.html.document_fromstring('<html><body></body></html>')
+    
+    def _preprocess_document(self, document):
         """Remove noise elements before extraction"""
-        for tag in soup(['script', 'style', 'nav', 'footer', 'aside', 'header']):
-            tag.decompose()
+        etree.strip_elements(document, *_NOISE_TAGS, with_tail=False)
         
         # Remove comments
-        from bs4 import Comment
-        comments = soup.find_all(string=lambda text: isinstance(text, Comment))
-        for comment in comments:
-            comment.extract()
-    
-    def _get_element_id(self, element) -> str:
-        """Create content-based hash for reliable deduplication"""
-        if element is None:
-            return ""
-        
-        text_content = element.get_text()[:100].strip()
-        children_count = len(list(element.children))
-        return f"{element.name}:{hash((text_content, children_count))}"
+        etree.strip_elements(document, etree.Comment, with_tail=False)
     
     def _is_already_processed(self, element) -> bool:
         """Check if element was already processed"""
-        element_id = self._get_element_id(element)
-        return element_id in self.processed_elements
+        return element in self.processed_elements
     
     def _mark_as_processed(self, element):
         """Mark element as processed"""
-        element_id = self._get_element_id(element)
-        self.processed_elements.add(element_id)
+        self.processed_elements.add(element)
+    
+    def _mark_subtree_as_processed(self, element):
+        """Mark element and all descendant tags as processed to prevent duplicate extraction"""
+        processed = self.processed_elements
+        processed.add(element)
+        processed.update(element.iterdescendants())
     
     def _is_inside_processed_container(self, element) -> bool:
         """Check if element is inside an already processed container"""
-        parent_containers = ['table', 'ul', 'ol', 'dl']
-        for container in parent_containers:
-            if element.find_parent(container):
-                parent = element.find_parent(container)
-                if self._is_already_processed(parent):
-                    return True
+        parent = element.getparent()
+        while parent is not None:
+            if parent in self.processed_elements:
+                return True
+            parent = parent.getparent()
         return False
     
-    def _extract_with_direct_chunking(self, soup: BeautifulSoup):
+    def _extract_with_direct_chunking(self, document):
         """Extract content and organize into chunks directly"""
         
         # Create pre-H2 chunk for content before first H2
@@ -107,10 +172,17 @@ class HTMLContentExtractor:
         chunk_index = 1
         
         # Find main content area
-        main_area = soup.find('article') or soup.find('main') or soup.find('body') or soup
-        
-        # Process all elements in document order
-        for element in main_area.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'table', 'ul', 'ol', 'dl', 'section', 'div']):
+        main_area = document
+        for tag in _MAIN_AREA_TAGS:
+            candidate = document.find(f'.//{tag}')
+            if candidate is not None:
+                main_area = candidate
+                break
+        
+        # Process all elements in a single document-order walk
+        for element in main_area.iterdescendants():
+            if element.tag not in _BLOCK_TAGS:
+                continue
             
             # Skip if already processed or inside processed container
             if self._is_already_processed(element) or self._is_inside_processed_container(element):
@@ -122,7 +194,7 @@ class HTMLContentExtractor:
                 continue
             
             # Handle H2 sections
-            if formatted_content.startswith('H2:'):
+            if formatted_content[0] == 'H2':
                 # Save previous chunk
                 if current_chunk_content:
                     self.big_chunks.append({
@@ -162,15 +234,15 @@ class HTMLContentExtractor:
             })
         
         # Handle special sections (FAQ, Author)
-        self._extract_special_sections(soup)
+        self._extract_special_sections(document)
     
-    def _format_element_comprehensive(self, element) -> Optional[str]:
+    def _format_element_comprehensive(self, element) -> Optional[Tuple[str, str]]:
         """Format element with comprehensive fixes"""
         
         if self._is_already_processed(element):
             return None
         
-        tag_name = element.name.lower()
+        tag_name = element.tag
         
         # Detect and handle warning blocks first
         if self._is_warning_block(element):
@@ -204,138 +276,111 @@ class HTMLContentExtractor:
     
     def _is_warning_block(self, element) -> bool:
         """Detect warning blocks by content and structure"""
-        text = element.get_text().strip()
-        
-        # Check for warning patterns
-        warning_patterns = [
-            r'⚠️.*WARNING.*⚠️',
-            r'ADDICTION RISK WARNING',
-            r'BONUS RISK WARNING', 
-            r'FINANCIAL RISK WARNING',
-        ]
-        
-        for pattern in warning_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        
-        # Check CSS classes
-        classes = element.get('class', [])
-        warning_classes = ['warning', 'risk-alert', 'disclaimer', 'alert']
-        if any(cls in classes for cls in warning_classes):
+        # Check CSS classes first - no text materialization needed
+        classes = element.get('class', '').split()
+        if any(cls in _WARN_CLASSES for cls in classes):
             return True
         
-        return False
+        # Warning banners are only block containers; skip the text scan
+        # for headings, lists and tables
+        if element.tag not in _WARN_TEXT_TAGS:
+            return False
+        
+        # Check for warning patterns
+        return bool(_WARN_RE.search(self._text(element)))
     
-    def _format_warning_block(self, element) -> str:
+    def _format_warning_block(self, element) -> Optional[Tuple[str, str]]:
         """Format warning blocks as single WARNING entry"""
-        self._mark_as_processed(element)
-        
-        # Mark all children as processed to prevent duplicate extraction
-        for child in element.find_all():
-            self._mark_as_processed(child)
+        self._mark_subtree_as_processed(element)
         
-        text = self._clean_text_preserve_structure(element.get_text())
+        text = self._text(element)
         
         # Extract warning type
         if '⚠️' in text and 'WARNING' in text:
-            warning_match = re.search(r'⚠️[^⚠️]*WARNING[^⚠️]*⚠️', text)
+            warning_match = _WARNING_EXTRACT_RE.search(text)
             if warning_match:
                 warning_type = warning_match.group()
                 remaining_text = text.replace(warning_match.group(), '').strip()
-                return f"WARNING: {warning_type} // {remaining_text}"
+                return "WARNING", f"{warning_type} // {remaining_text}"
         
-        return f"WARNING: {text}"
+        return "WARNING", text
     
-    def _format_heading(self, element) -> str:
+    def _format_heading(self, element) -> Optional[Tuple[str, str]]:
         """Format headings with duplicate prefix fix"""
         self._mark_as_processed(element)
         
-        tag_name = element.name.upper()
-        text = self._clean_text_preserve_structure(element.get_text())
+        tag_name = element.tag.upper()
+        text = self._text(element)
         
         # Fix double prefix issue
         if text.startswith(f"{tag_name}:"):
             text = text[len(tag_name)+1:].strip()
         
-        return f"{tag_name}: {text}"
+        return tag_name, text
     
-    def _format_table_comprehensive(self, element) -> str:
+    def _format_table_comprehensive(self, element) -> Optional[Tuple[str, str]]:
         """Format tables comprehensively to prevent content leakage"""
-        self._mark_as_processed(element)
-        
-        # Mark ALL table children as processed to prevent downstream extraction
-        for child in element.find_all():
-            self._mark_as_processed(child)
+        self._mark_subtree_as_processed(element)
         
         rows = []
         headers = []
         
+        # Collect rows from the table and its row groups without re-searching
+        data_rows = []
+        for child in element:
+            if child.tag == 'tr':
+                data_rows.append(child)
+            elif child.tag in ('thead', 'tbody', 'tfoot'):
+                data_rows.extend(child.iterchildren('tr'))
+        
         # Get headers
-        header_row = element.find('tr')
-        if header_row and header_row.find('th'):
-            headers = [self._clean_text_preserve_structure(th.get_text()) 
-                      for th in header_row.find_all('th')]
+        if data_rows and data_rows[0].find('th') is not None:
+            headers = [self._text(th) for th in data_rows[0].iterchildren('th')]
         
-        # Process data rows
-        data_rows = element.find_all('tr')
         start_idx = 1 if headers else 0
         
         for tr in data_rows[start_idx:]:
-            cells = [self._clean_text_preserve_structure(td.get_text()) 
-                    for td in tr.find_all(['td', 'th'])]
+            # Cell text is already stripped, so emptiness is plain falsiness
+            cells = [self._text(td) for td in tr.iterchildren('td', 'th')]
+            if not any(cells):
+                continue
             
-            if cells and any(cell.strip() for cell in cells):
-                if headers and len(cells) == len(headers):
-                    # Pair headers with values
-                    paired = [f"{h}: {v}" for h, v in zip(headers, cells) if v.strip()]
-                    if paired:
-                        rows.append(" | ".join(paired))
-                else:
-                    # No headers, just join cells
-                    non_empty_cells = [cell for cell in cells if cell.strip()]
-                    if non_empty_cells:
-                        rows.append(" | ".join(non_empty_cells))
+            if headers and len(cells) == len(headers):
+                # Pair headers with non-empty values
+                rows.append(" | ".join(f"{h}: {v}" for h, v in zip(headers, cells) if v))
+            else:
+                # No headers, just join non-empty cells
+                rows.append(" | ".join(filter(None, cells)))
         
         if rows:
-            return f"TABLE: {' // '.join(rows)}"
+            return "TABLE", ' // '.join(rows)
         return None
     
-    def _format_list_comprehensive(self, element) -> str:
+    def _format_list_comprehensive(self, element) -> Optional[Tuple[str, str]]:
         """Format lists with comprehensive child processing"""
-        self._mark_as_processed(element)
-        
-        # Mark all list children as processed
-        for child in element.find_all():
-            self._mark_as_processed(child)
+        self._mark_subtree_as_processed(element)
         
-        items = []
-        list_type = "ORDERED" if element.name == 'ol' else "UNORDERED"
-        
-        for li in element.find_all('li', recursive=False):
-            text = self._clean_text_preserve_structure(li.get_text())
-            if text:
-                items.append(text)
+        list_type = "ORDERED" if element.tag == 'ol' else "UNORDERED"
+        items = ' // '.join(filter(None, (
+            self._text(li) for li in element.iterchildren('li')
+        )))
         
         if items:
-            return f"{list_type}_LIST: {' // '.join(items)}"
+            return f"{list_type}_LIST", items
         return None
     
-    def _format_definition_list_comprehensive(self, element) -> str:
+    def _format_definition_list_comprehensive(self, element) -> Optional[Tuple[str, str]]:
         """Format definition lists as FAQ or structured content"""
-        self._mark_as_processed(element)
-        
-        # Mark all children as processed
-        for child in element.find_all():
-            self._mark_as_processed(child)
+        self._mark_subtree_as_processed(element)
         
         definitions = []
         current_term = None
         
-        for elem in element.find_all(['dt', 'dd']):
-            if elem.name == 'dt':
-                current_term = self._clean_text_preserve_structure(elem.get_text())
-            elif elem.name == 'dd' and current_term:
-                definition = self._clean_text_preserve_structure(elem.get_text())
+        for elem in self._iter_definition_items(element):
+            if elem.tag == 'dt':
+                current_term = self._text(elem)
+            elif elem.tag == 'dd' and current_term:
+                definition = self._text(elem)
                 if definition:
                     definitions.append(f"{current_term}: {definition}")
                 current_term = None
@@ -343,12 +388,20 @@ class HTMLContentExtractor:
         if definitions:
             # Check if this looks like FAQ
             if any('?' in defn for defn in definitions):
-                return f"FAQ: {' // '.join(definitions)}"
+                return "FAQ", ' // '.join(definitions)
             else:
-                return f"DEFINITION_LIST: {' // '.join(definitions)}"
+                return "DEFINITION_LIST", ' // '.join(definitions)
         return None
     
-    def _format_paragraph(self, element) -> Optional[str]:
+    def _iter_definition_items(self, element):
+        """Yield a dl's dt/dd children, including those grouped in div wrappers"""
+        for child in element:
+            if child.tag in ('dt', 'dd'):
+                yield child
+            elif child.tag == 'div':
+                yield from child.iterchildren('dt', 'dd')
+    
+    def _format_paragraph(self, element) -> Optional[Tuple[str, str]]:
         """Format paragraphs with container awareness"""
         
         # Skip if inside processed containers
@@ -357,18 +410,18 @@ class HTMLContentExtractor:
         
         self._mark_as_processed(element)
         
-        text = self._clean_text_preserve_structure(element.get_text())
+        text = self._text(element)
         if not text:
             return None
         
         # Check for special paragraph types
-        classes = element.get('class', [])
+        classes = element.get('class', '').split()
         if 'lead' in classes:
-            return f"LEAD: {text}"
+            return "LEAD", text
         
-        return f"CONTENT: {text}"
+        return "CONTENT", text
     
-    def _format_container(self, element) -> Optional[str]:
+    def _format_container(self, element) -> Optional[Tuple[str, str]]:
         """Format div/section containers if they contain unique content"""
         
         # Skip if inside processed containers or already processed
@@ -376,92 +429,116 @@ class HTMLContentExtractor:
             return None
         
         # Only process containers with specific semantic meaning
-        classes = element.get('class', [])
+        classes = element.get('class', '').split()
         data_qa = element.get('data-qa', '')
         
         if 'faq' in classes or 'templateFAQ' in data_qa:
-            self._mark_as_processed(element)
-            for child in element.find_all():
-                self._mark_as_processed(child)
+            self._mark_subtree_as_processed(element)
+            if data_qa == 'templateFAQ':
+                self._faq_emitted = True
             
-            text = self._clean_text_preserve_structure(element.get_text())
-            return f"FAQ: {text}"
+            text = self._text(element)
+            return "FAQ", text
         
         return None
     
+    def _text(self, element) -> str:
+        """Return the element's cleaned text, computing it at most once per extraction"""
+        text = self._text_cache.get(element)
+        if text is None:
+            text = self._text_cache[element] = self._clean_text_preserve_structure(_fast_text(element))
+        return text
+    
     def _clean_text_preserve_structure(self, text: str) -> str:
         """Clean text while preserving meaningful structure"""
         if not text:
             return ""
         
-        # Fix line break artifacts but preserve meaningful breaks
-        text = re.sub(r'\n+', ' ', text)  # Replace newlines with spaces
-        text = re.sub(r'\s+', ' ', text)  # Collapse multiple spaces
-        text = text.strip()
-        
-        return text
+        # Collapse newlines and runs of whitespace in a single pass
+        return _WS_RE.sub(' ', text).strip()
     
-    def _extract_special_sections(self, soup: BeautifulSoup):
+    def _extract_special_sections(self, document):
         """Extract special sections like FAQ and Author info"""
         
-        # Extract FAQ section
-        faq_section = soup.find('section', attrs={'data-qa': 'templateFAQ'})
-        if faq_section and not self._is_already_processed(faq_section):
-            self._mark_as_processed(faq_section)
-            text = self._clean_text_preserve_structure(faq_section.get_text())
-            if text and self.big_chunks:
-                # Add to last chunk or create new one
-                self.big_chunks[-1]["small_chunks"].append(f"FAQ: {text}")
-        
-        # Extract author section
-        author_section = soup.find('section', attrs={'data-qa': 'templateAuthorCard'})
-        if author_section and not self._is_already_processed(author_section):
-            self._mark_as_processed(author_section)
-            text = self._clean_text_preserve_structure(author_section.get_text())
-            if text and self.big_chunks:
-                self.big_chunks[-1]["small_chunks"].append(f"AUTHOR: {text}")
+        # Sections still to find; the FAQ is skipped when the main walk emitted it
+        wanted = dict(_SPECIAL_SECTIONS)
+        if self._faq_emitted:
+            del wanted['templateFAQ']
+        
+        # Find the first section of each kind in a single walk
+        found = {}
+        for element in document.iter('section'):
+            data_qa = element.get('data-qa')
+            if data_qa in wanted and data_qa not in found:
+                found[data_qa] = element
+                if len(found) == len(wanted):
+                    break
+        
+        for data_qa, kind in wanted.items():
+            section = found.get(data_qa)
+            if section is not None and not self._is_already_processed(section):
+                self._mark_as_processed(section)
+                text = self._text(section)
+                if text and self.big_chunks:
+                    # Add to last chunk
+                    self.big_chunks[-1]["small_chunks"].append((kind, text))
     
-    def _create_final_json(self) -> str:
-        """Create final JSON structure"""
+    def _create_final_bytes(self) -> bytes:
+        """Create final JSON structure as UTF-8 bytes"""
         
         # Ensure we have at least one chunk
         if not self.big_chunks:
             self.big_chunks = [{
                 "big_chunk_index": 1,
-                "small_chunks": ["CONTENT: No content extracted"]
+                "small_chunks": [("CONTENT", "No content extracted")]
             }]
         
-        # Final deduplication pass
+        # Final deduplication pass, then render (kind, text) pairs
         for chunk in self.big_chunks:
-            chunk["small_chunks"] = self._deduplicate_content(chunk["small_chunks"])
+            chunk["small_chunks"] = [
+                f"{kind}: {text}" if text else f"{kind}:"
+                for kind, text in self._deduplicate_content(chunk["small_chunks"])
+            ]
         
         result = {
             "big_chunks": self.big_chunks
         }
         
-        safe_log(f"Created final JSON with {len(self.big_chunks)} chunks")
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        safe_log("Created final JSON with %d chunks", len(self.big_chunks))
+        # Compact for downstream parsers; indented only when debugging
+        return json_dumps_bytes(result, pretty=logger.isEnabledFor(logging.DEBUG))
     
-    def _deduplicate_content(self, content_list: List[str]) -> List[str]:
-        """Final deduplication of content within a chunk"""
+    def _deduplicate_content(self, items: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Final deduplication of (kind, text) items within a chunk"""
         seen = set()
         deduplicated = []
         
-        for content in content_list:
-            if not content or not content.strip():
-                continue
-            
-            # Normalize for comparison
-            normalized = content.strip().lower()
+        for kind, text in items:
+            # The tuple itself is the key - kinds are canonical and distinct
+            # casing is treated as distinct content
+            key = (kind, text.strip())
             
             # Skip exact duplicates
-            if normalized not in seen:
-                seen.add(normalized)
-                deduplicated.append(content.strip())
+            if key not in seen:
+                seen.add(key)
+                deduplicated.append(key)
         
         return deduplicated
 
 
+# Extractor instances are stateful during a run, so each thread (Streamlit
+# runs every session script on its own thread) reuses its own instance
+_thread_state = threading.local()
+
+
+def _get_shared_extractor() -> HTMLContentExtractor:
+    """Return this thread's reusable HTMLContentExtractor"""
+    extractor = getattr(_thread_state, 'extractor', None)
+    if extractor is None:
+        extractor = _thread_state.extractor = HTMLContentExtractor()
+    return extractor
+
+
 # Convenience function for external use
 def extract_html_content(html_content: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """
@@ -473,5 +550,4 @@ def extract_html_content(html_content: str) -> Tuple[bool, Optional[str], Option
     Returns:
         tuple: (success, organized_json_content, error_message)
     """
-    extractor = HTMLContentExtractor()
-    return extractor.extract_content(html_content)
+    return _get_shared_extractor().extract_content(html_content)
@@ -4,17 +4,66 @@ Report generation module for YMYL Audit Tool
 Converts markdown reports to Word documents
 """
 
+from __future__ import annotations
+
 import io
 import re
-from typing import Optional
-from docx import Document
-from docx.shared import Inches, RGBColor, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from typing import BinaryIO, Optional
 from utils.helpers import safe_log
 
+# python-docx is imported on first report generation (see _load_docx) so
+# importing this module stays cheap for code paths that never export
+Document = None
+Pt = None
+RGBColor = None
+WD_ALIGN_PARAGRAPH = None
+
+
+def _load_docx():
+    """Import python-docx names into module globals on first use"""
+    global Document, Pt, RGBColor, WD_ALIGN_PARAGRAPH
+    if Document is None:
+        from docx.shared import Pt, RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx import Document  # Bound last: marks loading complete
+
+# One match per line classifies the markdown element; alternatives are tried
+# in order and the named group that matched identifies the kind
+_LINE_RE = re.compile(
+    r'(?P<title># )'
+    r'|(?P<section>## )'
+    r'|(?P<subsection>### )'
+    r'|(?P<bold>\*\*.+\*\*$)'
+    r'|(?P<bullet>- )'
+    r'|(?P<rule>---)'
+)
+
+# Paragraph style for each heading kind matched by _LINE_RE
+_HEADING_STYLES = {
+    'title': 'Title',
+    'section': 'Heading 1',
+    'subsection': 'Heading 2',
+}
+
+_SEVERITY_RE = re.compile('[🔴🟠🟡🔵✅❌]')
+_BOLD_SPLIT_RE = re.compile(r'(\*\*.*?\*\*)')
+
+# Severity emoji -> (text label for better compatibility, run RGB or None)
+_SEVERITY_META = {
+    '🔴': ('[CRITICAL]', (231, 76, 60)),   # Red
+    '🟠': ('[HIGH]', (255, 152, 0)),       # Orange
+    '🟡': ('[MEDIUM]', (243, 156, 18)),    # Yellow
+    '🔵': ('[LOW]', (52, 152, 219)),       # Blue
+    '✅': ('[✓]', None),
+    '❌': ('[✗]', None),
+}
+
 class WordReportGenerator:
     """Converts markdown reports to professionally formatted Word documents"""
     
+    # Saved template document shared by all reports, built on first use
+    _template_bytes: Optional[bytes] = None
+    
     def __init__(self):
         """Initialize the report generator"""
         safe_log("WordReportGenerator initialized")
@@ -32,11 +81,31 @@ class WordReportGenerator:
         Returns:
             Word document as bytes
         """
+        doc_buffer = io.BytesIO()
+        self.write_report(markdown_content, doc_buffer, title, casino_mode)
+        return doc_buffer.getvalue()
+
+    def write_report(self, markdown_content: str, out: BinaryIO,
+                     title: str = "YMYL Compliance Audit Report", casino_mode: bool = False):
+        """
+        Generate Word document from markdown content and save it straight to a stream
+        
+        On failure an error document is written instead; on a seekable stream any
+        partially saved report is discarded first so the output stays a valid .docx.
+        
+        Args:
+            markdown_content: Markdown content to convert
+            out: Writable binary file-like object receiving the .docx data
+            title: Document title
+            casino_mode: Whether this is a casino-specific report
+        """
+        start = out.tell() if out.seekable() else None
         try:
-            safe_log(f"Generating Word report ({len(markdown_content):,} characters)")
+            safe_log("Generating Word report (%d characters)", len(markdown_content))
+            _load_docx()
             
-            # Create document
-            doc = Document()
+            # Create document from the pre-styled template (includes footer)
+            doc = self._new_document()
             
             # Setup document properties
             self._setup_document(doc, title, casino_mode)
@@ -44,28 +113,39 @@ class WordReportGenerator:
             # Parse and add content
             self._parse_markdown_content(doc, markdown_content)
             
-            # Add footer
-            self._add_footer(doc)
-            
-            # Save to memory
-            doc_buffer = io.BytesIO()
-            doc.save(doc_buffer)
-            doc_buffer.seek(0)
+            # Save directly to the caller's stream
+            doc.save(out)
             
             safe_log("Word document generation successful")
-            return doc_buffer.getvalue()
             
         except Exception as e:
-            safe_log(f"Word generation error: {e}")
-            return self._create_error_document(str(e))
+            safe_log("Word generation error: %s", e)
+            
+            # Drop any bytes a failed doc.save() already wrote
+            if start is not None:
+                out.seek(start)
+                out.truncate()
+            out.write(self._create_error_document(str(e)))
 
-    def _setup_document(self, doc: Document, title: str, casino_mode: bool):
-        """Setup document properties and styles"""
+    def _new_document(self) -> Document:
+        """Create a document from a cached template with styles and footer applied"""
+        template_bytes = WordReportGenerator._template_bytes
+        if template_bytes is None:
+            template = Document()
+            self._setup_template(template)
+            self._add_footer(template)
+            
+            template_buffer = io.BytesIO()
+            template.save(template_buffer)
+            template_bytes = WordReportGenerator._template_bytes = template_buffer.getvalue()
+        
+        return Document(io.BytesIO(template_bytes))
+
+    def _setup_template(self, doc: Document):
+        """Setup the report-independent properties and styles"""
         # Document properties
         properties = doc.core_properties
-        properties.title = title
         properties.author = "YMYL Audit Tool"
-        properties.subject = "Casino YMYL Compliance Report" if casino_mode else "YMYL Compliance Report"
         properties.category = "Compliance Report"
         
         # Setup default styles
@@ -75,6 +155,12 @@ class WordReportGenerator:
         normal_style.paragraph_format.space_after = Pt(6)
         normal_style.paragraph_format.line_spacing = 1.15
 
+    def _setup_document(self, doc: Document, title: str, casino_mode: bool):
+        """Setup per-report document properties"""
+        properties = doc.core_properties
+        properties.title = title
+        properties.subject = "Casino YMYL Compliance Report" if casino_mode else "YMYL Compliance Report"
+
     def _parse_markdown_content(self, doc: Document, markdown_content: str):
         """Parse markdown and add to document"""
         lines = markdown_content.split('\n')
@@ -94,31 +180,22 @@ class WordReportGenerator:
                 continue
             
             # Parse different markdown elements
-            if line.startswith('# '):
-                # Main title
-                paragraph = doc.add_paragraph(line[2:])
-                paragraph.style = 'Title'
-                skip_next_empty = True
-                
-            elif line.startswith('## '):
-                # Section heading
-                paragraph = doc.add_paragraph(line[3:])
-                paragraph.style = 'Heading 1'
-                skip_next_empty = True
-                
-            elif line.startswith('### '):
-                # Subsection heading
-                paragraph = doc.add_paragraph(line[4:])
-                paragraph.style = 'Heading 2'
+            match = _LINE_RE.match(line)
+            kind = match.lastgroup if match else None
+            
+            if kind in _HEADING_STYLES:
+                # Title, section or subsection heading
+                paragraph = doc.add_paragraph(line[match.end():])
+                paragraph.style = _HEADING_STYLES[kind]
                 skip_next_empty = True
                 
-            elif line.startswith('**') and line.endswith('**') and len(line) > 4:
+            elif kind == 'bold':
                 # Bold text paragraph
                 p = doc.add_paragraph()
                 run = p.add_run(line[2:-2])
                 run.bold = True
                 
-            elif line.startswith('- '):
+            elif kind == 'bullet':
                 # Bullet points
                 bullet_text = line[2:]
                 
@@ -133,7 +210,7 @@ class WordReportGenerator:
                 else:
                     doc.add_paragraph(bullet_text, style='List Bullet')
                     
-            elif line.startswith('---'):
+            elif kind == 'rule':
                 # Horizontal rule
                 doc.add_paragraph()
                 p = doc.add_paragraph('_' * 50)
@@ -149,16 +226,15 @@ class WordReportGenerator:
                 
             else:
                 # Regular paragraph
-                if line:
-                    if '**' in line:
-                        p = doc.add_paragraph()
-                        self._add_formatted_text_to_paragraph(p, line)
-                    else:
-                        doc.add_paragraph(line)
+                if '**' in line:
+                    p = doc.add_paragraph()
+                    self._add_formatted_text_to_paragraph(p, line)
+                else:
+                    doc.add_paragraph(line)
 
-    def _add_formatted_text_to_paragraph(self, paragraph, text):
-        """Add text with embedded bold formatting"""
-        parts = re.split(r'(\*\*.*?\*\*)', text)
+    def _add_formatted_text_to_paragraph(self, paragraph, text, severity_color: Optional[RGBColor] = None):
+        """Add text with embedded bold formatting, optionally as a colored severity line"""
+        parts = _BOLD_SPLIT_RE.split(text)
         
         for part in parts:
             if part.startswith('**') and part.endswith('**') and len(part) > 4:
@@ -167,51 +243,38 @@ class WordReportGenerator:
                 run.bold = True
             elif part:
                 # Regular text
-                paragraph.add_run(part)
+                run = paragraph.add_run(part)
+            else:
+                continue
+            
+            # Severity lines are bold and colored throughout
+            if severity_color:
+                run.bold = True
+                run.font.color.rgb = severity_color
 
     def _contains_severity_indicator(self, line: str) -> bool:
         """Check if line contains severity indicators"""
-        return any(indicator in line for indicator in ['🔴', '🟠', '🟡', '🔵', '✅', '❌'])
+        return _SEVERITY_RE.search(line) is not None
 
     def _add_severity_formatted_text(self, paragraph, text):
         """Add severity indicator text with color formatting"""
-        # Replace emoji with text for better compatibility
-        emoji_replacements = {
-            '🔴': '[CRITICAL]',
-            '🟠': '[HIGH]',
-            '🟡': '[MEDIUM]',
-            '🔵': '[LOW]',
-            '✅': '[✓]',
-            '❌': '[✗]'
-        }
-        
-        display_text = text
         severity_color = None
         
-        for emoji, replacement in emoji_replacements.items():
-            if emoji in display_text:
-                display_text = display_text.replace(emoji, replacement)
-                # Set color based on severity
-                if emoji == '🔴':
-                    severity_color = RGBColor(231, 76, 60)  # Red
-                elif emoji == '🟠':
-                    severity_color = RGBColor(255, 152, 0)  # Orange
-                elif emoji == '🟡':
-                    severity_color = RGBColor(243, 156, 18)  # Yellow
-                elif emoji == '🔵':
-                    severity_color = RGBColor(52, 152, 219)  # Blue
+        def replace_emoji(match):
+            # Swap emoji for its label; the first graded severity sets the color
+            nonlocal severity_color
+            label, color = _SEVERITY_META[match.group()]
+            if severity_color is None:
+                severity_color = color
+            return label
         
-        # Add formatted text
-        if '**' in display_text:
-            self._add_formatted_text_to_paragraph(paragraph, display_text)
-        else:
-            run = paragraph.add_run(display_text)
+        # Replace emoji with text and pick the color in a single pass
+        display_text = _SEVERITY_RE.sub(replace_emoji, text)
         
-        # Apply severity color
+        # Add formatted text, colored at run creation
         if severity_color:
-            for run in paragraph.runs:
-                run.font.color.rgb = severity_color
-                run.bold = True
+            severity_color = RGBColor(*severity_color)
+        self._add_formatted_text_to_paragraph(paragraph, display_text, severity_color)
 
     def _add_footer(self, doc: Document):
         """Add simple footer"""
@@ -223,11 +286,12 @@ class WordReportGenerator:
             footer_para.style.font.size = Pt(9)
             footer_para.style.font.color.rgb = RGBColor(127, 140, 141)
         except Exception as e:
-            safe_log(f"Could not add footer: {e}")
+            safe_log("Could not add footer: %s", e)
 
     def _create_error_document(self, error_message: str) -> bytes:
         """Create error document when generation fails"""
         try:
+            _load_docx()
             doc = Document()
             doc.add_heading('Report Generation Error', 0)
             doc.add_paragraph(f'Failed to generate report: {error_message}')
@@ -257,4 +321,20 @@ def generate_word_report(markdown_content: str, title: str = "YMYL Compliance Au
         Word document as bytes
     """
     generator = WordReportGenerator()
-    return generator.generate_report(markdown_content, title, casino_mode)
\ No newline at end of file
+    return generator.generate_report(markdown_content, title, casino_mode)
+
+
+def generate_word_report_stream(markdown_content: str, out: BinaryIO,
+                                title: str = "YMYL Compliance Audit Report",
+                                casino_mode: bool = False):
+    """
+    Generate Word document from markdown content directly into a stream
+    
+    Args:
+        markdown_content: Markdown content to convert
+        out: Writable binary file-like object receiving the .docx data
+        title: Document title
+        casino_mode: Whether this is a casino-specific report
+    """
+    generator = WordReportGenerator()
+    generator.write_report(markdown_content, out, title, casino_mode)
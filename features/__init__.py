@@ -4,7 +4,23 @@ Features package for YMYL Audit Tool
 Contains all analysis feature implementations
 """
 
-from .url_analysis import URLAnalysisFeature
-from .html_analysis import HTMLAnalysisFeature
+import importlib
+
+# Feature classes are imported on first access (PEP 562) so importing the
+# package does not pull in every feature's parsing/reporting dependencies
+_LAZY_FEATURES = {
+    'URLAnalysisFeature': '.url_analysis',
+    'HTMLAnalysisFeature': '.html_analysis',
+}
 
 __all__ = ['URLAnalysisFeature', 'HTMLAnalysisFeature']
+
+
+def __getattr__(name):
+    module_name = _LAZY_FEATURES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    feature_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = feature_class  # Cache so later lookups skip __getattr__
+    return feature_class
@@ -5,17 +5,43 @@ Defines common interface for all analysis features
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Tuple, Optional
+from typing import Callable, Dict, Any, List, Tuple, Optional
 import streamlit as st
+import time
 from datetime import datetime
+from utils.helpers import json_loads, safe_log
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _build_chunk_previews(extracted_content: str) -> List[Tuple[int, List[str], int]]:
+    """Build per-chunk preview rows (index, first 3 truncated small chunks, small chunk count)"""
+    # Parse directly: a cached dict would be deep-copied on every cache hit
+    previews = []
+    for index, chunk in enumerate(json_loads(extracted_content).get('big_chunks', []), 1):
+        small_chunks = chunk.get('small_chunks', [])
+        snippets = [small[:150] + "..." if len(small) > 150 else small for small in small_chunks[:3]]
+        previews.append((index, snippets, len(small_chunks)))
+    return previews
+
 
 class BaseAnalysisFeature(ABC):
     """Base class for all analysis features"""
     
+    # Session and widget keys whose prefixed names are built once per instance
+    SESSION_KEYS = (
+        'input_method', 'html_content', 'zip_file', 'url_input', 'upload_cache',
+        'extracted_content', 'extraction_metrics', 'source_info', 'extraction_time', 'casino_mode'
+    )
+    
     def __init__(self):
         """Initialize base feature"""
         self.feature_id = self.__class__.__name__.lower().replace('analysisfeature', '').replace('feature', '')
         self.session_key_prefix = f"{self.feature_id}_"
+        self._tracked_keys_name = f"_{self.feature_id}_tracked_keys"
+        self._casino_mode_key = f"casino_mode_{self.feature_id}"
+        
+        # Pre-build the prefixed keys used on every rerun
+        self._session_keys = {key: f"{self.session_key_prefix}{key}" for key in self.SESSION_KEYS}
     
     @abstractmethod
     def get_input_interface(self) -> Dict[str, Any]:
@@ -45,13 +71,45 @@ class BaseAnalysisFeature(ABC):
         """Get display name for this feature"""
         pass
     
+    def _run_extractor(self, label: str, extractor: Callable[[str], Tuple[bool, Optional[str], Optional[str]]],
+                       source: str) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Run an extractor with the shared logging and error handling
+        
+        Args:
+            label: Source label for log and error messages (e.g. "HTML", "URL")
+            extractor: Callable returning (success, extracted_content_json, error_message)
+            source: Input passed to the extractor
+            
+        Returns:
+            Tuple of (success, extracted_content_json, error_message)
+        """
+        try:
+            success, extracted_content, error = extractor(source)
+            
+            if success:
+                safe_log("%s extraction successful: %d characters", label, len(extracted_content))
+                return True, extracted_content, None
+            else:
+                safe_log("%s extraction failed: %s", label, error)
+                return False, None, error
+                
+        except Exception as e:
+            error_msg = f"Unexpected error during {label} extraction: {str(e)}"
+            safe_log(error_msg)
+            return False, None, error_msg
+    
     def supports_casino_mode(self) -> bool:
         """Whether this feature supports casino-specific analysis"""
         return True
     
     def get_session_key(self, key: str) -> str:
         """Get prefixed session state key"""
-        return f"{self.session_key_prefix}{key}"
+        session_key = self._session_keys.get(key) or f"{self.session_key_prefix}{key}"
+        
+        # Track every key handed out (widgets included) so clearing needn't scan all state
+        st.session_state.setdefault(self._tracked_keys_name, set()).add(session_key)
+        return session_key
     
     def set_session_data(self, key: str, value: Any):
         """Set data in session state with feature prefix"""
@@ -71,10 +129,10 @@ class BaseAnalysisFeature(ABC):
                 del st.session_state[session_key]
         else:
             # Clear all feature data
-            keys_to_remove = [k for k in st.session_state.keys() 
-                            if k.startswith(self.session_key_prefix)]
-            for key in keys_to_remove:
-                del st.session_state[key]
+            tracked_keys = st.session_state.get(self._tracked_keys_name, set())
+            for key in tracked_keys:
+                st.session_state.pop(key, None)
+            tracked_keys.clear()
     
     def show_casino_mode_toggle(self) -> bool:
         """Show casino mode toggle if supported"""
@@ -82,7 +140,7 @@ class BaseAnalysisFeature(ABC):
             return False
         
         # Use a simpler key to avoid conflicts
-        key = f"casino_mode_{self.feature_id}"
+        key = self._casino_mode_key
         
         return st.checkbox(
             "🎰 Casino Review Mode",
@@ -119,25 +177,48 @@ class BaseAnalysisFeature(ABC):
         st.success("✅ Content extracted successfully!")
         
         # Store in session
-        self.set_session_data('extracted_content', extracted_content)
+        self.set_extracted_content(extracted_content)
         self.set_session_data('source_info', source_info)
-        self.set_session_data('extraction_time', datetime.now().isoformat())
+        self.set_session_data('extraction_time', time.time_ns())
         
         # Show preview info
         st.info(f"💡 Content ready for AI analysis from: **{source_info}**")
     
+    def get_chunk_previews(self, extracted_content: str) -> List[Tuple[int, List[str], int]]:
+        """
+        Get preview rows for the extracted content structure (cached per content string)
+        
+        Args:
+            extracted_content: JSON string produced by extract_content
+            
+        Returns:
+            List of (big_chunk_number, preview_snippets, small_chunk_count); raises ValueError on invalid JSON
+        """
+        return _build_chunk_previews(extracted_content)
+    
+    def set_extracted_content(self, extracted_content: str):
+        """Store extracted content together with its metrics, computed once here"""
+        self.set_session_data('extracted_content', extracted_content)
+        self.set_session_data('extraction_metrics', self._compute_extraction_metrics(extracted_content))
+    
     def get_extraction_metrics(self, extracted_content: str) -> Dict[str, Any]:
         """Get metrics about extracted content"""
+        # Metrics stored alongside the same content need no reparse
+        metrics = self.get_session_data('extraction_metrics')
+        if metrics is not None and self.get_session_data('extracted_content') == extracted_content:
+            return metrics
+        
+        return self._compute_extraction_metrics(extracted_content)
+    
+    def _compute_extraction_metrics(self, extracted_content: str) -> Dict[str, Any]:
+        """Count chunks and size of extracted content"""
         try:
-            import json
-            content_data = json.loads(extracted_content)
-            big_chunks = content_data.get('big_chunks', [])
-            
-            total_small_chunks = sum(len(chunk.get('small_chunks', [])) for chunk in big_chunks)
+            # Derived from the cached preview rows, so one parse serves metrics and preview
+            previews = self.get_chunk_previews(extracted_content)
             
             return {
-                'big_chunks': len(big_chunks),
-                'small_chunks': total_small_chunks,
+                'big_chunks': len(previews),
+                'small_chunks': sum(small_chunk_count for _, _, small_chunk_count in previews),
                 'json_size': len(extracted_content),
                 'content_size_mb': len(extracted_content) / (1024 * 1024)
             }
@@ -163,6 +244,13 @@ class BaseAnalysisFeature(ABC):
         """Get extracted content from session"""
         return self.get_session_data('extracted_content')
     
+    def get_extraction_time(self) -> Optional[str]:
+        """Get extraction time from session as an ISO timestamp, formatted on demand"""
+        extraction_time_ns = self.get_session_data('extraction_time')
+        if extraction_time_ns is None:
+            return None
+        return datetime.fromtimestamp(extraction_time_ns / 1e9).isoformat()
+    
     def get_source_info(self) -> str:
         """Get source information from session"""
         return self.get_session_data('source_info', 'Unknown source')
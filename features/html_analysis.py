@@ -7,11 +7,113 @@ Handles HTML file and ZIP archive content analysis without individual casino mod
 import streamlit as st
 import zipfile
 import io
+import re
+import hashlib
 from typing import Dict, Any, Tuple, Optional
 from features.base_feature import BaseAnalysisFeature
 from core.html_extractor import extract_html_content
 from utils.helpers import safe_log
 
+# Maximum accepted HTML size (5MB)
+MAX_HTML_SIZE = 5 * 1024 * 1024
+
+# Characters of the document head/tail inspected by the HTML validity check
+_SCAN_WINDOW = 4096
+
+# Structural tags looked for by the HTML validity check
+_OPEN_TAG_RE = re.compile(r'<(html|body)', re.IGNORECASE)
+_CLOSE_TAG_RE = re.compile(r'</(html|body)>', re.IGNORECASE)
+
+
+def _is_valid_html(html_content: str) -> bool:
+    """Basic HTML validation"""
+    if not html_content:
+        return False
+    
+    # Structural tags live near the start and end, so only look at those windows
+    head = html_content[:_SCAN_WINDOW]
+    tail = html_content[-_SCAN_WINDOW:]
+    
+    # Length without surrounding whitespace, without copying the whole document
+    leading = len(head) - len(head.lstrip())
+    trailing = len(tail) - len(tail.rstrip())
+    if leading < len(head) and trailing < len(tail):
+        content_length = len(html_content) - leading - trailing
+    else:
+        content_length = len(html_content.strip())
+    
+    if content_length < 10:
+        return False
+    
+    # Check for basic HTML structure
+    opened = {tag.lower() for tag in _OPEN_TAG_RE.findall(head)}
+    closed = {tag.lower() for tag in _CLOSE_TAG_RE.findall(tail)}
+    has_html_tag = 'html' in opened and 'html' in closed
+    has_body_tag = 'body' in opened and 'body' in closed
+    has_content = content_length > 50
+    
+    return has_html_tag or has_body_tag or has_content
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _validate_zip_file_cached(zip_digest: str, _zip_bytes: bytes) -> Tuple[bool, str, str]:
+    """
+    Validate ZIP file and extract HTML content, memoized across reruns
+    
+    Args:
+        zip_digest: Content digest of the archive, used as the cache key
+        _zip_bytes: Raw bytes of the uploaded ZIP archive (not hashed by Streamlit)
+        
+    Returns:
+        tuple: (is_valid, html_content, error_message)
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(_zip_bytes), 'r') as zip_file:
+            # Find HTML members straight from the archive's own entry list
+            html_info = None
+            html_count = 0
+            for info in zip_file.infolist():
+                name = info.filename
+                if name.startswith('__MACOSX/') or not name.lower().endswith(('.html', '.htm')):
+                    continue
+                html_count += 1
+                if html_info is None:
+                    html_info = info
+            
+            if html_info is None:
+                return False, "", "No HTML files found in ZIP archive"
+            
+            if html_count > 1:
+                return False, "", f"Multiple HTML files found ({html_count}). ZIP must contain exactly one HTML file"
+            
+            # Check size from the archive header before inflating anything
+            if html_info.file_size > MAX_HTML_SIZE:
+                return False, "", f"HTML file too large: {html_info.file_size:,} bytes (max: 5MB)"
+            
+            # Decode straight from the inflate stream, dropping any BOM so ASCII pages stay 1 byte per char
+            with zip_file.open(html_info, 'r') as raw:
+                html_content = io.TextIOWrapper(raw, encoding='utf-8-sig', errors='ignore').read()
+            
+            # Validate HTML content
+            if not _is_valid_html(html_content):
+                return False, "", "HTML file contains invalid or incomplete content"
+            
+            return True, html_content, ""
+            
+    except zipfile.BadZipFile:
+        return False, "", "Invalid or corrupted ZIP file"
+    except UnicodeDecodeError:
+        return False, "", "HTML file contains invalid character encoding"
+    except Exception as e:
+        return False, "", f"Error processing ZIP file: {str(e)}"
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _extract_html_content_cached(html_content: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Run the HTML extractor, memoized so reruns with the same input skip parsing"""
+    return extract_html_content(html_content)
+
+
 class HTMLAnalysisFeature(BaseAnalysisFeature):
     """Feature for analyzing content from HTML files or ZIP archives"""
     
@@ -30,14 +132,13 @@ class HTMLAnalysisFeature(BaseAnalysisFeature):
             disabled=disabled
         )
         
-        # Input interface based on method
-        input_data = {'input_method': input_method}
-        
+        # Input interface based on method; tag its dict in place rather than merging into a new one
         if input_method == "📝 Paste HTML":
-            input_data.update(self._render_simple_html_interface(disabled))
+            input_data = self._render_simple_html_interface(disabled)
         else:
-            input_data.update(self._render_simple_zip_interface(disabled))
+            input_data = self._render_simple_zip_interface(disabled)
         
+        input_data['input_method'] = input_method
         return input_data
     
     def _render_simple_html_interface(self, disabled: bool = False) -> Dict[str, Any]:
@@ -76,22 +177,30 @@ class HTMLAnalysisFeature(BaseAnalysisFeature):
         html_content = ""
         
         if uploaded_file:
-            try:
-                if uploaded_file.name.lower().endswith('.zip'):
-                    zip_bytes = uploaded_file.getvalue()
-                    is_valid, html_content, error_message = self._validate_zip_file(zip_bytes)
-                else:
-                    # Direct HTML file
-                    html_content = uploaded_file.getvalue().decode('utf-8', errors='ignore')
-                    is_valid, error_message = self._validate_html_content(html_content)
-                
-                if not is_valid:
-                    st.error(f"❌ {error_message}")
+            # Reuse the result for this upload so unrelated reruns skip reading the file
+            cached_upload = self.get_session_data('upload_cache')
+            if cached_upload and cached_upload[0] == uploaded_file.file_id:
+                is_valid, html_content, error_message = cached_upload[1]
+            else:
+                try:
+                    if uploaded_file.name.lower().endswith('.zip'):
+                        zip_bytes = uploaded_file.getvalue()
+                        is_valid, html_content, error_message = self._validate_zip_file(zip_bytes)
+                    else:
+                        # Direct HTML file (BOM dropped so ASCII pages stay 1 byte per char)
+                        html_content = uploaded_file.getvalue().decode('utf-8-sig', errors='ignore')
+                        is_valid, error_message = self._validate_html_content(html_content)
                     
-            except Exception as e:
-                is_valid = False
-                error_message = f"Error reading file: {str(e)}"
+                    self.set_session_data('upload_cache', (uploaded_file.file_id, (is_valid, html_content, error_message)))
+                        
+                except Exception as e:
+                    is_valid = False
+                    error_message = f"Error reading file: {str(e)}"
+            
+            if not is_valid:
                 st.error(f"❌ {error_message}")
+        else:
+            self.clear_session_data('upload_cache')
         
         return {
             'zip_file': uploaded_file,
@@ -103,56 +212,12 @@ class HTMLAnalysisFeature(BaseAnalysisFeature):
     
     def _is_valid_html(self, html_content: str) -> bool:
         """Basic HTML validation"""
-        if not html_content or len(html_content.strip()) < 10:
-            return False
-        
-        html_lower = html_content.lower().strip()
-        
-        # Check for basic HTML structure
-        has_html_tag = '<html' in html_lower and '</html>' in html_lower
-        has_body_tag = '<body' in html_lower and '</body>' in html_lower
-        has_content = len(html_content.strip()) > 50
-        
-        return has_html_tag or has_body_tag or has_content
+        return _is_valid_html(html_content)
     
     def _validate_zip_file(self, zip_bytes: bytes) -> Tuple[bool, str, str]:
         """Validate ZIP file and extract HTML content"""
-        try:
-            with zipfile.ZipFile(io.BytesIO(zip_bytes), 'r') as zip_file:
-                # Get file list
-                file_list = zip_file.namelist()
-                
-                # Filter HTML files
-                html_files = [f for f in file_list 
-                             if f.lower().endswith(('.html', '.htm')) 
-                             and not f.startswith('__MACOSX/')]
-                
-                if len(html_files) == 0:
-                    return False, "", "No HTML files found in ZIP archive"
-                
-                if len(html_files) > 1:
-                    return False, "", f"Multiple HTML files found ({len(html_files)}). ZIP must contain exactly one HTML file"
-                
-                # Extract HTML content
-                html_file = html_files[0]
-                html_content = zip_file.read(html_file).decode('utf-8', errors='ignore')
-                
-                # Validate HTML content
-                if not self._is_valid_html(html_content):
-                    return False, "", "HTML file contains invalid or incomplete content"
-                
-                # Check size
-                if len(html_content) > 5 * 1024 * 1024:  # 5MB limit
-                    return False, "", f"HTML file too large: {len(html_content):,} characters (max: 5MB)"
-                
-                return True, html_content, ""
-                
-        except zipfile.BadZipFile:
-            return False, "", "Invalid or corrupted ZIP file"
-        except UnicodeDecodeError:
-            return False, "", "HTML file contains invalid character encoding"
-        except Exception as e:
-            return False, "", f"Error processing ZIP file: {str(e)}"
+        zip_digest = hashlib.blake2b(zip_bytes, digest_size=16).hexdigest()
+        return _validate_zip_file_cached(zip_digest, zip_bytes)
     
     def validate_input(self, input_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Validate HTML input"""
@@ -164,7 +229,7 @@ class HTMLAnalysisFeature(BaseAnalysisFeature):
         if len(html_content) < 10:
             return False, "HTML content is too short"
         
-        if len(html_content) > 5 * 1024 * 1024:  # 5MB limit
+        if len(html_content) > MAX_HTML_SIZE:
             return False, f"HTML content is too large: {len(html_content):,} characters (max: 5MB)"
         
         if not self._is_valid_html(html_content):
@@ -177,23 +242,9 @@ class HTMLAnalysisFeature(BaseAnalysisFeature):
         html_content = input_data['html_content']
         source_type = input_data.get('source_type', 'unknown')
         
-        safe_log(f"Starting HTML content extraction ({source_type}, {len(html_content):,} chars)")
+        safe_log("Starting HTML content extraction (%s, %d chars)", source_type, len(html_content))
         
-        try:
-            # Use HTML extractor
-            success, extracted_content, error = extract_html_content(html_content)
-            
-            if success:
-                safe_log(f"HTML extraction successful: {len(extracted_content):,} characters")
-                return True, extracted_content, None
-            else:
-                safe_log(f"HTML extraction failed: {error}")
-                return False, None, error
-                
-        except Exception as e:
-            error_msg = f"Unexpected error during HTML extraction: {str(e)}"
-            safe_log(error_msg)
-            return False, None, error_msg
+        return self._run_extractor("HTML", _extract_html_content_cached, html_content)
     
     def get_progress_steps(self) -> list:
         """Get HTML-specific progress steps"""
@@ -210,7 +261,7 @@ class HTMLAnalysisFeature(BaseAnalysisFeature):
         if not self._is_valid_html(html_content):
             return False, "HTML file contains invalid or incomplete content"
         
-        if len(html_content) > 5 * 1024 * 1024:  # 5MB limit
+        if len(html_content) > MAX_HTML_SIZE:
             return False, f"HTML file too large: {len(html_content):,} characters (max: 5MB)"
         
         return True, ""
@@ -8,7 +8,7 @@ import streamlit as st
 from typing import Dict, Any, Tuple, Optional
 from features.base_feature import BaseAnalysisFeature
 from core.extractor import extract_url_content
-from utils.helpers import validate_url, safe_log
+from utils.helpers import validate_url, safe_log, extract_domain
 
 class URLAnalysisFeature(BaseAnalysisFeature):
     """Feature for analyzing content from web URLs"""
@@ -56,23 +56,9 @@ class URLAnalysisFeature(BaseAnalysisFeature):
         """Extract content from URL"""
         url = input_data['url']
         
-        safe_log(f"Starting URL content extraction from: {url}")
+        safe_log("Starting URL content extraction from: %s", url)
         
-        try:
-            # Use existing extractor
-            success, extracted_content, error = extract_url_content(url)
-            
-            if success:
-                safe_log(f"URL extraction successful: {len(extracted_content):,} characters")
-                return True, extracted_content, None
-            else:
-                safe_log(f"URL extraction failed: {error}")
-                return False, None, error
-                
-        except Exception as e:
-            error_msg = f"Unexpected error during URL extraction: {str(e)}"
-            safe_log(error_msg)
-            return False, None, error_msg
+        return self._run_extractor("URL", extract_url_content, url)
     
     def get_progress_steps(self) -> list:
         """Get URL-specific progress steps"""
@@ -88,7 +74,6 @@ class URLAnalysisFeature(BaseAnalysisFeature):
         """Get description of the content source"""
         url = input_data.get('url', '')
         try:
-            from utils.helpers import extract_domain
             domain = extract_domain(url)
             return f"URL: {domain}" if domain else f"URL: {url}"
         except Exception:
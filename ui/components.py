@@ -5,10 +5,55 @@ Reusable Streamlit UI components
 """
 
 import streamlit as st
+import re
 import time
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Tuple, Dict, Any
 from core.auth import get_current_user
+from config.settings import validate_configuration
+from core.reporter import generate_word_report
+
+# Maximum characters of raw JSON highlighted in previews before truncating
+JSON_PREVIEW_CHARS = 4096
+
+# Report sections start at level-2 headings
+_REPORT_SECTION_RE = re.compile(r'\n(?=## )')
+
+# Static sidebar help, sent to the frontend as a single markdown element
+_INFO_PANEL_MD = """
+### ℹ️ How to Use
+
+**Step-by-step:**
+
+1️⃣ **Enter URL** - Paste the webpage URL you want to analyze
+
+2️⃣ **Choose Mode** - Select regular or casino review mode
+
+3️⃣ **Click Analyze** - AI will process the content (takes 2-5 minutes)
+
+4️⃣ **Download Report** - Get professionally formatted Word document
+
+5️⃣ **Import to Google Docs** - Upload the Word file to Google Drive
+
+### 🎯 Features
+
+- **Structured Analysis**: Content organized by sections
+- **YMYL Compliance**: Checks against guidelines
+- **Casino Mode**: Specialized gambling content review
+- **Word Export**: Professional document formatting
+- **Google Docs Ready**: Perfect import compatibility
+
+### ⚡ Tips
+
+- Analysis takes 2-5 minutes for thorough review
+- Casino mode uses specialized gambling guidelines
+- Word documents preserve all formatting in Google Docs
+- Refresh page to start fresh analysis
+"""
+
+# http(s) scheme followed by at least one dot, ignoring surrounding whitespace
+_URL_RE = re.compile(r'\s*https?://[^.]*\.', re.IGNORECASE)
 
 def create_header():
     """Create the main page header"""
@@ -38,48 +83,32 @@ def create_url_input(two_step_mode: bool = False) -> Tuple[str, bool, bool]:
     st.subheader("📝 Content Analysis")
     
     # URL input
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        url = st.text_input(
-            "Enter the URL to analyze:",
-            placeholder="https://example.com/page-to-analyze",
-            help="Enter the full URL including http:// or https://",
-            key="url_input"
-        )
-    
-    with col2:
-        st.markdown("<br>", unsafe_allow_html=True)  # Spacing
-        casino_mode = st.checkbox(
-            "🎰 Casino Review Mode",
-            help="Use specialized AI assistant for gambling content analysis",
-            key="casino_mode"
-        )
-    
-    # Button section
-    col1, col2, col3 = st.columns([2, 1, 2])
-    
-    with col2:
-        if two_step_mode:
-            # Admin mode - Extract button
-            button_clicked = st.button(
-                "📄 Extract Content",
-                type="primary",
-                use_container_width=True,
-                help="Extract and structure content from URL",
-                key="extract_button",
-                disabled=not url or not url.strip()
-            )
-        else:
-            # Regular mode - Analyze button  
-            button_clicked = st.button(
-                "🚀 Analyze Content",
-                type="primary",
-                use_container_width=True,
-                help="Extract content and analyze for YMYL compliance",
-                key="analyze_button",
-                disabled=not url or not url.strip()
-            )
+    url = st.text_input(
+        "Enter the URL to analyze:",
+        placeholder="https://example.com/page-to-analyze",
+        help="Enter the full URL including http:// or https://",
+        key="url_input"
+    )
+    
+    casino_mode = st.checkbox(
+        "🎰 Casino Review Mode",
+        help="Use specialized AI assistant for gambling content analysis",
+        key="casino_mode"
+    )
+    
+    # Admin mode extracts first; regular mode analyzes directly
+    if two_step_mode:
+        label, help_text, key = "📄 Extract Content", "Extract and structure content from URL", "extract_button"
+    else:
+        label, help_text, key = "🚀 Analyze Content", "Extract content and analyze for YMYL compliance", "analyze_button"
+    
+    button_clicked = st.button(
+        label,
+        type="primary",
+        help=help_text,
+        key=key,
+        disabled=not url or not url.strip()
+    )
     
     # Show URL validation
     if url and not _is_valid_url(url):
@@ -130,23 +159,20 @@ def create_results_display(analysis_result: Dict[str, Any], word_bytes: bytes, f
     
     st.info("💡 **Tip**: The Word document imports perfectly into Google Docs!")
 
+@contextmanager
 def create_loading_animation(message: str = "Processing..."):
     """
-    Create a simple loading animation
+    Show a loading spinner for the duration of the wrapped work
+    
+    Usage:
+        with create_loading_animation("Extracting..."):
+            do_work()
     
     Args:
         message: Loading message to display
     """
-    placeholder = st.empty()
-    
-    loading_chars = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-    
-    for i in range(10):  # Show for ~2 seconds
-        char = loading_chars[i % len(loading_chars)]
-        placeholder.text(f"{char} {message}")
-        time.sleep(0.2)
-    
-    placeholder.empty()
+    with st.spinner(message):
+        yield
 
 def create_error_display(error_message: str, show_details: bool = False):
     """
@@ -172,38 +198,7 @@ def create_error_display(error_message: str, show_details: bool = False):
 def create_info_panel():
     """Create informational panel with usage instructions"""
     with st.sidebar:
-        st.markdown("### ℹ️ How to Use")
-        
-        st.markdown("""
-        **Step-by-step:**
-        
-        1️⃣ **Enter URL** - Paste the webpage URL you want to analyze
-        
-        2️⃣ **Choose Mode** - Select regular or casino review mode
-        
-        3️⃣ **Click Analyze** - AI will process the content (takes 2-5 minutes)
-        
-        4️⃣ **Download Report** - Get professionally formatted Word document
-        
-        5️⃣ **Import to Google Docs** - Upload the Word file to Google Drive
-        """)
-        
-        st.markdown("### 🎯 Features")
-        st.markdown("""
-        - **Structured Analysis**: Content organized by sections
-        - **YMYL Compliance**: Checks against guidelines
-        - **Casino Mode**: Specialized gambling content review  
-        - **Word Export**: Professional document formatting
-        - **Google Docs Ready**: Perfect import compatibility
-        """)
-        
-        st.markdown("### ⚡ Tips")
-        st.markdown("""
-        - Analysis takes 2-5 minutes for thorough review
-        - Casino mode uses specialized gambling guidelines
-        - Word documents preserve all formatting in Google Docs
-        - Refresh page to start fresh analysis
-        """)
+        st.markdown(_INFO_PANEL_MD)
 
 def _is_valid_url(url: str) -> bool:
     """
@@ -215,21 +210,89 @@ def _is_valid_url(url: str) -> bool:
     Returns:
         True if URL appears valid
     """
-    if not url:
-        return False
+    return bool(url) and _URL_RE.match(url) is not None
+
+@st.fragment
+def show_markdown_report(markdown_report: str, key: str):
+    """
+    Show a markdown report split into collapsible sections
+    
+    Each "## " section gets its own expander (only the first is open), so the
+    browser renders one moderate markdown block at a time instead of the whole
+    report; a toggle switches to plain text for very large reports. Runs as a
+    fragment so the toggle doesn't rerun (and clear) the surrounding results.
+    
+    Args:
+        markdown_report: Markdown report to display
+        key: Unique widget key prefix for this report
+    """
+    if st.toggle("Render as plain text", key=f"{key}_plain_text"):
+        st.text(markdown_report)
+        return
     
-    url = url.strip().lower()
-    return url.startswith(('http://', 'https://')) and '.' in url
+    for i, section in enumerate(_REPORT_SECTION_RE.split(markdown_report)):
+        title = section.split('\n', 1)[0].lstrip('# ').strip() or f"Section {i + 1}"
+        with st.expander(title, expanded=(i == 0)):
+            st.markdown(section)
+
+def show_json_preview(json_content: str, key: str):
+    """
+    Show a bounded JSON preview, with the full document available on demand
+    
+    Only the first JSON_PREVIEW_CHARS characters are highlighted on each rerun;
+    longer documents get a download button and a button to render them in full.
+    
+    Args:
+        json_content: JSON string to preview
+        key: Unique widget key prefix for this preview
+    """
+    if len(json_content) <= JSON_PREVIEW_CHARS:
+        st.code(json_content, language='json')
+        return
+    
+    if st.session_state.get(f"{key}_show_full"):
+        st.code(json_content, language='json')
+    else:
+        st.code(json_content[:JSON_PREVIEW_CHARS], language='json')
+        st.caption(f"Preview truncated to {JSON_PREVIEW_CHARS:,} of {len(json_content):,} characters")
+        st.button("Show full JSON", key=f"{key}_show_full_button",
+                  on_click=st.session_state.__setitem__, args=(f"{key}_show_full", True))
+    
+    st.download_button(
+        label="⬇️ Download full JSON",
+        data=json_content,
+        file_name="extracted_content.json",
+        mime="application/json",
+        key=f"{key}_download"
+    )
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def generate_word_report_cached(markdown_content: str, title: str, casino_mode: bool = False) -> bytes:
+    """
+    Generate the Word report, reusing earlier output for identical inputs
+    
+    Args:
+        markdown_content: Markdown report to convert
+        title: Document title
+        casino_mode: Whether this is a casino-specific report
+        
+    Returns:
+        Word document as bytes
+    """
+    return generate_word_report(markdown_content, title, casino_mode)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_validate_configuration() -> Tuple[bool, list]:
+    """Validate configuration at most once a minute instead of on every rerun"""
+    return validate_configuration()
 
 def show_configuration_status():
     """Show configuration validation status in sidebar"""
-    from config.settings import validate_configuration
-    
     with st.sidebar:
         st.markdown("### 🔧 System Status")
         
         try:
-            is_valid, errors = validate_configuration()
+            is_valid, errors = _cached_validate_configuration()
             
             if is_valid:
                 st.success("✅ Configuration OK")
@@ -5,14 +5,18 @@ Handles two-step process with detailed insights
 """
 
 import streamlit as st
-import asyncio
-import concurrent.futures
 from datetime import datetime
 from typing import Dict, Any
-from utils.feature_registry import FeatureRegistry
+from utils.feature_registry import get_cached_handler
 from core.analyzer import analyze_content
-from core.reporter import generate_word_report
-from utils.helpers import safe_log
+from ui.components import generate_word_report_cached, show_json_preview, show_markdown_report
+from utils.helpers import safe_log, run_async
+
+# Session key prefixes owned by the analysis features (cleared on reset)
+FEATURE_KEY_PREFIXES = ('url_analysis_', 'html_analysis_')
+
+# Session key holding the current admin step (set once extraction completes)
+ADMIN_STEP_KEY = '_admin_step'
 
 class AdminLayout:
     """Admin layout with two-step detailed process"""
@@ -26,7 +30,7 @@ class AdminLayout:
         
         # Get feature handler
         try:
-            feature_handler = FeatureRegistry.get_handler(selected_feature)
+            feature_handler = get_cached_handler(selected_feature)
         except ValueError as e:
             st.error(f"❌ {str(e)}")
             return
@@ -46,11 +50,7 @@ class AdminLayout:
     
     def _get_current_step(self) -> int:
         """Determine current step based on session state"""
-        # Check if any feature has extracted content
-        for key in st.session_state.keys():
-            if key.endswith('_extracted_content') and st.session_state[key]:
-                return 2
-        return 1
+        return st.session_state.get(ADMIN_STEP_KEY, 1)
     
     def _render_step1_extraction(self, feature_handler):
         """Render Step 1: Content Extraction"""
@@ -87,6 +87,7 @@ class AdminLayout:
             st.error("❌ No extracted content found. Please restart extraction.")
             if st.button("🔄 Back to Step 1"):
                 feature_handler.clear_session_data()
+                st.session_state.pop(ADMIN_STEP_KEY, None)
                 st.rerun()
             return
         
@@ -100,6 +101,7 @@ class AdminLayout:
         with col2:
             if st.button("🗑️ Clear & Restart", help="Clear extracted content"):
                 feature_handler.clear_session_data()
+                st.session_state.pop(ADMIN_STEP_KEY, None)
                 st.rerun()
         
         # Show extraction details
@@ -136,11 +138,12 @@ class AdminLayout:
                 return
             
             # Store results
-            feature_handler.set_session_data('extracted_content', extracted_content)
+            feature_handler.set_extracted_content(extracted_content)
             feature_handler.set_session_data('source_info', 
                 feature_handler.get_source_description(input_data))
             feature_handler.set_session_data('casino_mode', 
                 input_data.get('casino_mode', False))
+            st.session_state[ADMIN_STEP_KEY] = 2
             
             status.update(label="✅ Content extracted successfully!", state="complete")
         
@@ -165,28 +168,28 @@ class AdminLayout:
         # Show structured content preview
         with st.expander("👁️ View Extracted Content Structure"):
             try:
-                import json
-                content_data = json.loads(extracted_content)
-                big_chunks = content_data.get('big_chunks', [])
-                
-                for i, chunk in enumerate(big_chunks, 1):
-                    st.markdown(f"**📦 Big Chunk {i}:**")
-                    small_chunks = chunk.get('small_chunks', [])
-                    
-                    for j, small_chunk in enumerate(small_chunks[:3], 1):
-                        preview = small_chunk[:150] + "..." if len(small_chunk) > 150 else small_chunk
-                        st.text(f"  {j}. {preview}")
-                    
-                    if len(small_chunks) > 3:
-                        st.text(f"  ... and {len(small_chunks) - 3} more chunks")
-                    st.markdown("---")
-                    
-            except json.JSONDecodeError:
+                # Build the whole structure as one markdown element rather than several per chunk
+                parts = []
+                for i, previews, small_chunk_count in feature_handler.get_chunk_previews(extracted_content):
+                    parts.append(f"**📦 Big Chunk {i}:**")
+
+                    # Previews go in a plain-text fence so page content isn't rendered as markdown
+                    lines = [f"  {j}. {preview}" for j, preview in enumerate(previews, 1)]
+                    if small_chunk_count > 3:
+                        lines.append(f"  ... and {small_chunk_count - 3} more chunks")
+                    if lines:
+                        parts.append("~~~text\n" + "\n".join(lines) + "\n~~~")
+                    parts.append("---")
+
+                if parts:
+                    st.markdown("\n\n".join(parts))
+
+            except ValueError:
                 st.error("❌ Could not parse JSON")
         
-        # Show raw JSON
+        # Show raw JSON, truncated so large documents don't bloat every rerun
         with st.expander("🤖 JSON Data Sent to AI"):
-            st.code(extracted_content, language='json')
+            show_json_preview(extracted_content, key="admin_json")
     
     def _process_ai_analysis(self, extracted_content: str, casino_mode: bool, source_info: str):
         """Process AI analysis with admin details"""
@@ -194,13 +197,10 @@ class AdminLayout:
         try:
             # Run analysis
             with st.status("Running AI analysis...") as status:
-                
-                async def run_analysis():
-                    return await analyze_content(extracted_content, casino_mode)
-                
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(lambda: asyncio.run(run_analysis()))
-                    analysis_result = future.result(timeout=300)
+                analysis_result = run_async(
+                    analyze_content(extracted_content, casino_mode), timeout=300,
+                    on_poll=lambda elapsed: status.update(label=f"Running AI analysis... {int(elapsed)}s")
+                )
                 
                 status.update(label="✅ Analysis complete!", state="complete")
             
@@ -209,27 +209,20 @@ class AdminLayout:
                 st.error(f"❌ AI analysis failed: {error_msg}")
                 return
             
-            # Generate report
-            with st.status("Generating Word report..."):
-                word_bytes = generate_word_report(
-                    analysis_result['report'],
-                    f"YMYL Report - {source_info}",
-                    casino_mode
-                )
-            
             st.success("✅ Analysis complete!")
             
             # Show admin analysis results
-            self._show_analysis_results(analysis_result, word_bytes)
+            self._show_analysis_results(analysis_result)
             
-            # Download
-            self._show_download(word_bytes)
+            # Download (the Word report is generated on click)
+            self._show_download(analysis_result['report'], f"YMYL Report - {source_info}", casino_mode,
+                                datetime.now().strftime("%Y%m%d_%H%M%S"))
             
         except Exception as e:
             st.error(f"❌ Analysis failed: {str(e)}")
-            safe_log(f"Analysis error: {e}")
+            safe_log("Analysis error: %s", e)
     
-    def _show_analysis_results(self, analysis_result: Dict[str, Any], word_bytes: bytes):
+    def _show_analysis_results(self, analysis_result: Dict[str, Any]):
         """Show analysis results for admin"""
         st.markdown("### 📊 Analysis Results")
         
@@ -238,51 +231,39 @@ class AdminLayout:
         with col1:
             st.metric("Processing Time", f"{analysis_result.get('processing_time', 0):.1f}s")
         with col2:
-            ai_response = analysis_result.get('ai_response', [])
-            violations = sum(1 for section in ai_response 
-                            if section.get('violations') != "no violation found" 
-                            and section.get('violations')) if isinstance(ai_response, list) else 0
-            st.metric("Violations Found", violations)
+            st.metric("Violations Found", analysis_result.get('violations_found', 0))
         
         # Show markdown report
         st.markdown("### 📄 Generated Report")
-        st.markdown(analysis_result.get('report', ''))
+        show_markdown_report(analysis_result.get('report', ''), key="admin_report_view")
         
         # Raw AI response
         with st.expander("🤖 View Raw AI Response"):
             st.json(analysis_result.get('ai_response', {}))
     
-    def _show_download(self, word_bytes: bytes):
-        """Show download button"""
-        from datetime import datetime
+    @st.fragment
+    def _show_download(self, markdown_report: str, title: str, casino_mode: bool, timestamp: str):
+        """Show download button that builds the Word report only when clicked
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        A fragment, so the click reruns only the button and the results above stay on screen.
+        """
         filename = f"ymyl_report_{timestamp}.docx"
         
         st.download_button(
             label="📄 Download Report",
-            data=word_bytes,
+            data=lambda: generate_word_report_cached(markdown_report, title, casino_mode),  # Deferred (streamlit>=1.52)
             file_name=filename,
             mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             type="primary"
         )
     
     def _render_step_indicator(self):
-        """Render step progress indicator"""
-        st.markdown("### 📋 Progress")
+        """Render step progress indicator as a single markdown element"""
+        # Reached steps are green with a check, pending ones blue with their number
+        step1 = ":green[✅ Step 1: Content Extraction]" if self.current_step >= 1 else ":blue[1️⃣ Step 1: Content Extraction]"
+        step2 = ":green[✅ Step 2: AI Analysis]" if self.current_step >= 2 else ":blue[2️⃣ Step 2: AI Analysis]"
         
-        # Step indicators
-        if self.current_step >= 1:
-            st.success("✅ Step 1: Content Extraction")
-        else:
-            st.info("1️⃣ Step 1: Content Extraction")
-        
-        if self.current_step >= 2:
-            st.success("✅ Step 2: AI Analysis")
-        else:
-            st.info("2️⃣ Step 2: AI Analysis")
-        
-        st.markdown("---")
+        st.markdown(f"### 📋 Progress\n\n{step1}\n\n{step2}\n\n---")
     
     def _render_admin_controls(self, feature_handler):
         """Render admin-specific controls"""
@@ -294,20 +275,14 @@ class AdminLayout:
         
         # Step info
         if self.current_step == 1:
-            st.markdown("**Current**: Content extraction phase")
-            st.markdown("**Next**: AI analysis with detailed metrics")
+            st.markdown("**Current**: Content extraction phase\n\n**Next**: AI analysis with detailed metrics\n\n---")
         else:
-            st.markdown("**Current**: AI analysis phase")
-            st.markdown("**Available**: Detailed processing insights")
-        
-        st.markdown("---")
+            st.markdown("**Current**: AI analysis phase\n\n**Available**: Detailed processing insights\n\n---")
         
         # Reset button
         if st.button("🔄 Reset Everything", help="Clear all data and start fresh"):
             # Clear all session data for all features
-            keys_to_remove = [k for k in st.session_state.keys() 
-                            if any(k.startswith(prefix) for prefix in 
-                                  ['url_analysis_', 'html_analysis_'])]
-            for key in keys_to_remove:
-                del st.session_state[key]
+            for key in [k for k in list(st.session_state.keys()) if k.startswith(FEATURE_KEY_PREFIXES)]:
+                st.session_state.pop(key, None)
+            st.session_state.pop(ADMIN_STEP_KEY, None)
             st.rerun()
\ No newline at end of file
@@ -5,14 +5,12 @@ Handles simple one-step process with report display and persistent state
 """
 
 import streamlit as st
-import asyncio
-import concurrent.futures
 from datetime import datetime
 from typing import Dict, Any
-from utils.feature_registry import FeatureRegistry
+from utils.feature_registry import get_cached_handler
 from core.analyzer import analyze_content
-from core.reporter import generate_word_report
-from utils.helpers import safe_log
+from ui.components import generate_word_report_cached, show_markdown_report
+from utils.helpers import safe_log, run_async
 
 class UserLayout:
     """Simple user layout with one-step process and report display"""
@@ -22,7 +20,7 @@ class UserLayout:
         
         # Get feature handler
         try:
-            feature_handler = FeatureRegistry.get_handler(selected_feature)
+            feature_handler = get_cached_handler(selected_feature)
         except ValueError as e:
             st.error(f"❌ {str(e)}")
             return
@@ -38,8 +36,9 @@ class UserLayout:
     def _render_analysis_interface(self, feature_handler, analysis_key: str, casino_mode: bool):
         """Render simple analysis interface with emergency stop support"""
         
-        # Check processing state
-        is_processing = st.session_state.get('is_processing', False)
+        # Check processing state (session state proxy bound once for this render)
+        session = st.session_state
+        is_processing = session.get('is_processing', False)
         
         # Get input interface (disabled if processing)
         input_data = feature_handler.get_input_interface(disabled=is_processing)
@@ -58,34 +57,40 @@ class UserLayout:
         
         # Process full analysis
         if analyze_clicked:
-            st.session_state['is_processing'] = True
+            session['is_processing'] = True
             st.rerun()
             
         # Process analysis if button was clicked
-        if st.session_state.get('is_processing') and not st.session_state.get('stop_processing'):
+        if session.get('is_processing') and not session.get('stop_processing'):
             self._process_full_analysis_with_stop(feature_handler, input_data, analysis_key)
     
+    @st.fragment
     def _show_results_with_report(self, analysis_key: str):
-        """Show results with markdown preview and download"""
+        """Show results with markdown preview and download (a fragment, so clicks here rerun only this panel)"""
         st.success("✅ **Analysis Complete!**")
         
         # Get stored data
-        markdown_report = st.session_state.get(f'{analysis_key}_report')
-        word_bytes = st.session_state.get(f'{analysis_key}_word_bytes')
-        source_info = st.session_state.get(f'{analysis_key}_source_info', 'Analysis')
+        session = st.session_state
+        markdown_report = session.get(f'{analysis_key}_report')
+        source_info = session.get(f'{analysis_key}_source_info', 'Analysis')
+        casino_mode = session.get(f'{analysis_key}_casino_mode', False)
+        timestamp = session.get(f'{analysis_key}_timestamp') or datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # FIRST show download and action buttons
-        # Download button with unique key
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Download button with unique key, named after the analysis time
         filename = f"ymyl_report_{timestamp}.docx"
         
         col1, col2 = st.columns(2)
         
         with col1:
-            if word_bytes:
+            if markdown_report:
+                # The Word document is built (and cached) only when the button is clicked
+                # (callable data needs streamlit>=1.52)
                 st.download_button(
                     label="📄 Download Word Report",
-                    data=word_bytes,
+                    data=lambda: generate_word_report_cached(
+                        markdown_report, f"YMYL Report - {source_info}", casino_mode
+                    ),
                     file_name=filename,
                     mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                     type="primary",
@@ -96,9 +101,8 @@ class UserLayout:
         with col2:
             if st.button("🔄 Analyze Another", use_container_width=True, key=f"new_analysis_{analysis_key}"):
                 # Clear stored results for this analysis type
-                keys_to_clear = [k for k in st.session_state.keys() if k.startswith(analysis_key)]
-                for key in keys_to_clear:
-                    del st.session_state[key]
+                for key in session.pop(f'{analysis_key}_tracked_keys', []):
+                    session.pop(key, None)
                 st.rerun()
         
         # Info about import
@@ -107,7 +111,7 @@ class UserLayout:
         # THEN display the markdown report
         if markdown_report:
             st.markdown("### 📄 YMYL Compliance Report")
-            st.markdown(markdown_report)
+            show_markdown_report(markdown_report, key=f"{analysis_key}_report_view")
     
     def _process_full_analysis_with_stop(self, feature_handler, input_data: Dict[str, Any], analysis_key: str):
         """Process complete analysis in one step with emergency stop support"""
@@ -147,12 +151,10 @@ class UserLayout:
                 # Step 2: AI Analysis
                 casino_mode = input_data.get('casino_mode', False)
                 
-                async def run_analysis():
-                    return await analyze_content(extracted_content, casino_mode)
-                
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(lambda: asyncio.run(run_analysis()))
-                    analysis_result = future.result(timeout=300)
+                analysis_result = run_async(
+                    analyze_content(extracted_content, casino_mode), timeout=300,
+                    on_poll=lambda elapsed: status.update(label=f"Running AI analysis... {int(elapsed)}s")
+                )
                 
                 # Check for stop signal
                 if st.session_state.get('stop_processing'):
@@ -166,35 +168,37 @@ class UserLayout:
                     st.session_state['is_processing'] = False
                     return
                 
-                status.update(label="Generating Word report...", state="running")
-                
-                # Step 3: Generate Report
                 source_info = feature_handler.get_source_description(input_data)
-                word_bytes = generate_word_report(
-                    analysis_result['report'],
-                    f"YMYL Report - {source_info}",
-                    casino_mode
-                )
                 
                 status.update(label="✅ Analysis complete!", state="complete")
             
-            # Store results in session state with unique keys to prevent conflicts
-            st.session_state[f'{analysis_key}_complete'] = True
-            st.session_state[f'{analysis_key}_report'] = analysis_result['report']
-            st.session_state[f'{analysis_key}_word_bytes'] = word_bytes
-            st.session_state[f'{analysis_key}_source_info'] = source_info
-            st.session_state[f'{analysis_key}_processing_time'] = analysis_result.get('processing_time', 0)
+            # Store results in session state with unique keys to prevent conflicts,
+            # remembering which keys were written so "Analyze Another" can clear just those
+            results = {
+                'complete': True,
+                'report': analysis_result['report'],
+                'source_info': source_info,
+                'casino_mode': casino_mode,
+                'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S"),
+                'processing_time': analysis_result.get('processing_time', 0)
+            }
+            tracked_keys = []
+            for name, value in results.items():
+                key = f'{analysis_key}_{name}'
+                st.session_state[key] = value
+                tracked_keys.append(key)
+            st.session_state[f'{analysis_key}_tracked_keys'] = tracked_keys
             
             # Clear processing state
             st.session_state['is_processing'] = False
             
             # Log success
-            safe_log(f"User analysis completed successfully for {source_info}")
+            safe_log("User analysis completed successfully for %s", source_info)
             
             # Rerun to show results
             st.rerun()
             
         except Exception as e:
             st.error(f"❌ Analysis failed: {str(e)}")
-            safe_log(f"Full analysis error: {e}")
+            safe_log("Full analysis error: %s", e)
             st.session_state['is_processing'] = False
\ No newline at end of file
@@ -4,14 +4,26 @@ Feature Registry for YMYL Audit Tool
 Manages dynamic loading and registration of analysis features
 """
 
-from typing import Dict, Any, Type
+import streamlit as st
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Type
 from utils.helpers import safe_log
 
+# Seconds lookups wait for background feature registration before proceeding
+REGISTRATION_TIMEOUT = 5
+
+# Set once the default features have been imported and registered
+_registration_complete = threading.Event()
+
 class FeatureRegistry:
     """Central registry for managing analysis features"""
     
     _features = {}
+    _features_view = MappingProxyType(_features)  # Live read-only view, no copy per call
     _handlers = {}
+    _handler_instances = {}
     
     @classmethod
     def register_feature(cls, feature_id: str, feature_config: Dict[str, Any], handler_class: Type):
@@ -25,17 +37,38 @@ class FeatureRegistry:
         """
         cls._features[feature_id] = feature_config
         cls._handlers[feature_id] = handler_class
-        safe_log(f"Registered feature: {feature_id}")
+        cls._handler_instances.pop(feature_id, None)
+        safe_log("Registered feature: %s", feature_id)
     
     @classmethod
-    def get_available_features(cls) -> Dict[str, Dict[str, Any]]:
-        """Get all available features with their metadata"""
-        return cls._features.copy()
+    def wait_for_registration(cls, timeout: float = REGISTRATION_TIMEOUT) -> bool:
+        """
+        Block until the default features are registered
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            True if registration finished, False on timeout
+        """
+        if _registration_complete.wait(timeout):
+            return True
+        safe_log("Timed out waiting for feature registration after %ss", timeout, level="WARNING")
+        return False
+    
+    @classmethod
+    def get_available_features(cls) -> Mapping[str, Dict[str, Any]]:
+        """Get all available features with their metadata (read-only view)"""
+        cls.wait_for_registration()
+        return cls._features_view
     
     @classmethod
     def get_handler(cls, feature_id: str):
         """
-        Get handler instance for a feature
+        Get handler instance for a feature, constructed once and reused
+        
+        Handlers keep their per-user state in st.session_state, so one instance
+        per feature can serve every caller.
         
         Args:
             feature_id: Feature identifier
@@ -43,23 +76,46 @@ class FeatureRegistry:
         Returns:
             Handler instance
         """
-        if feature_id not in cls._handlers:
-            raise ValueError(f"Unknown feature: {feature_id}")
-        
-        handler_class = cls._handlers[feature_id]
-        return handler_class()
+        handler = cls._handler_instances.get(feature_id)
+        if handler is None:
+            cls.wait_for_registration()
+            if feature_id not in cls._handlers:
+                raise ValueError(f"Unknown feature: {feature_id}")
+            
+            handler = cls._handlers[feature_id]()
+            cls._handler_instances[feature_id] = handler
+        return handler
     
     @classmethod
     def is_feature_available(cls, feature_id: str) -> bool:
         """Check if a feature is available"""
+        cls.wait_for_registration()
         return feature_id in cls._features
     
     @classmethod
     def get_feature_config(cls, feature_id: str) -> Dict[str, Any]:
         """Get configuration for a specific feature"""
+        cls.wait_for_registration()
         return cls._features.get(feature_id, {})
 
 
+@st.cache_resource(show_spinner=False)
+def get_cached_handler(feature_id: str):
+    """
+    Get a handler instance built once per process and reused across reruns
+    
+    FeatureRegistry.get_handler reuses instances too; this wrapper lets
+    st.cache_resource manage their lifetime (e.g. cleared with the app caches).
+    
+    Args:
+        feature_id: Feature identifier
+        
+    Returns:
+        Handler instance (raises ValueError for unknown features, which is not cached)
+    """
+    return FeatureRegistry.get_handler(feature_id)
+
+
 # Auto-register available features
 def _register_default_features():
     """Register default features with better error handling"""
@@ -80,9 +136,9 @@ def _register_default_features():
         )
         safe_log("Successfully registered URL Analysis feature")
     except ImportError as e:
-        safe_log(f"URL Analysis feature not available: {e}")
+        safe_log("URL Analysis feature not available: %s", e)
     except Exception as e:
-        safe_log(f"Error registering URL Analysis feature: {e}")
+        safe_log("Error registering URL Analysis feature: %s", e)
     
     # HTML Analysis Feature  
     try:
@@ -100,13 +156,21 @@ def _register_default_features():
         )
         safe_log("Successfully registered HTML Analysis feature")
     except ImportError as e:
-        safe_log(f"HTML Analysis feature not available: {e}")
+        safe_log("HTML Analysis feature not available: %s", e)
+    except Exception as e:
+        safe_log("Error registering HTML Analysis feature: %s", e)
+
+def _register_default_features_in_background():
+    """Import and register default features, then release waiting lookups"""
+    start = time.perf_counter()
+    try:
+        _register_default_features()
+        safe_log("Feature registration complete in %.2fs. Available features: %d",
+                 time.perf_counter() - start, len(FeatureRegistry._features))
     except Exception as e:
-        safe_log(f"Error registering HTML Analysis feature: {e}")
+        safe_log("Critical error during feature registration: %s", e)
+    finally:
+        _registration_complete.set()
 
-# Initialize features on module load with error handling
-try:
-    _register_default_features()
-    safe_log(f"Feature registration complete. Available features: {len(FeatureRegistry.get_available_features())}")
-except Exception as e:
-    safe_log(f"Critical error during feature registration: {e}")
+# Register features on a background thread so their heavy imports overlap app startup
+threading.Thread(target=_register_default_features_in_background, name='ymyl-feature-registration', daemon=True).start()
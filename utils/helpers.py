@@ -4,11 +4,23 @@ Helper utilities for YMYL Audit Tool
 Common utility functions used across the application
 """
 
+import asyncio
+import concurrent.futures
+import json
 import logging
+import os
 import time
 import re
+import threading
 from datetime import datetime
-from typing import Any, Optional, Dict
+from functools import lru_cache, wraps
+from typing import Any, Awaitable, Callable, Optional, Dict, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 # Setup simple logging
 logging.basicConfig(
@@ -18,20 +30,89 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def safe_log(message: str, level: str = "INFO"):
+# Level names accepted by safe_log
+_LOG_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL
+}
+
+# Worker threads for blocking calls made from the shared event loop
+THREAD_POOL_SIZE = int(os.getenv('YMYL_THREAD_POOL_SIZE', '8'))
+
+# Shared event loop, started on first use by get_background_loop()
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+def safe_log(message: str, *args: Any, level: str = "INFO"):
     """
     Safely log a message
     
     Args:
-        message: Message to log
+        message: Message to log, optionally with %-style placeholders
+        *args: Values for the placeholders, formatted only if the record is emitted
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
     try:
-        log_level = getattr(logging, level.upper(), logging.INFO)
-        logger.log(log_level, message)
+        log_level = _LOG_LEVELS.get(level) or _LOG_LEVELS.get(level.upper(), logging.INFO)
+        if logger.isEnabledFor(log_level):
+            logger.log(log_level, message, *args)
     except Exception:
         # Fallback to print if logging fails
-        print(f"[{level}] {message}")
+        print(f"[{level}] {message}", *args)
+
+def json_dumps(data: Any, pretty: bool = False) -> str:
+    """
+    Serialize data to JSON, using orjson when available
+    
+    Args:
+        data: JSON-serializable data
+        pretty: Indent the output for human reading instead of compact form
+        
+    Returns:
+        JSON string (non-ASCII characters are kept as-is)
+    """
+    if orjson is not None:
+        options = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(data, option=options).decode('utf-8')
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def json_dumps_bytes(data: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON without an intermediate str when orjson is available
+    
+    Args:
+        data: JSON-serializable data
+        pretty: Indent the output for human reading instead of compact form
+        
+    Returns:
+        JSON as UTF-8 bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json_dumps(data, pretty).encode('utf-8')
+
+def json_loads(data: Any) -> Any:
+    """
+    Parse JSON text, using orjson when available
+    
+    Args:
+        data: JSON document as str or bytes
+        
+    Returns:
+        Parsed Python object (raises ValueError on invalid JSON)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# File size units and their byte divisors for format_file_size
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+_SIZE_DIVISORS = (1, 1 << 10, 1 << 20, 1 << 30)
 
 def format_file_size(size_bytes: int) -> str:
     """
@@ -43,14 +124,17 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted size string
     """
-    if size_bytes < 1024:
+    # Each unit spans 10 bits, so the bit length selects it directly
+    unit = max(0, min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1))
+    if unit == 0:
         return f"{size_bytes} B"
-    elif size_bytes < 1024**2:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024**3:
-        return f"{size_bytes / (1024**2):.1f} MB"
-    else:
-        return f"{size_bytes / (1024**3):.1f} GB"
+    return f"{size_bytes / _SIZE_DIVISORS[unit]:.1f} {_SIZE_UNITS[unit]}"
+
+# Control characters (except tab, newline and carriage return) removed by clean_text via str.translate
+_CONTROL_CHARS_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+
+# Whitespace runs collapsed by clean_text, compiled once at import
+_WHITESPACE_PATTERN = re.compile(r'\s+')
 
 def clean_text(text: str) -> str:
     """
@@ -66,13 +150,22 @@ def clean_text(text: str) -> str:
         return ""
     
     # Remove extra whitespace
-    cleaned = re.sub(r'\s+', ' ', text.strip())
+    cleaned = _WHITESPACE_PATTERN.sub(' ', text.strip())
     
     # Remove control characters but keep newlines and tabs
-    cleaned = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', cleaned)
+    cleaned = cleaned.translate(_CONTROL_CHARS_TABLE)
     
     return cleaned.strip()
 
+# Basic URL pattern, compiled once at import
+_URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
+    r'localhost|'  # localhost
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # IP
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
 def validate_url(url: str) -> bool:
     """
     Basic URL validation
@@ -86,18 +179,7 @@ def validate_url(url: str) -> bool:
     if not url or not isinstance(url, str):
         return False
     
-    url = url.strip()
-    
-    # Basic pattern check
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
-        r'localhost|'  # localhost
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # IP
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    
-    return bool(url_pattern.match(url))
+    return bool(_URL_PATTERN.match(url.strip()))
 
 def safe_int(value: Any, default: int = 0) -> int:
     """
@@ -110,6 +192,9 @@ def safe_int(value: Any, default: int = 0) -> int:
     Returns:
         Integer value or default
     """
+    # Exact ints need no conversion (bool still goes through int())
+    if type(value) is int:
+        return value
     try:
         return int(value)
     except (ValueError, TypeError):
@@ -126,6 +211,8 @@ def safe_float(value: Any, default: float = 0.0) -> float:
     Returns:
         Float value or default
     """
+    if type(value) is float:
+        return value
     try:
         return float(value)
     except (ValueError, TypeError):
@@ -167,18 +254,85 @@ def measure_execution_time(func):
     Returns:
         Decorated function
     """
+    @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        # Skip timing entirely when the message would not be logged
+        if not logger.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+        
+        start_ns = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e9
         
-        execution_time = end_time - start_time
-        safe_log(f"{func.__name__} executed in {execution_time:.3f} seconds")
+        safe_log("%s executed in %.3f seconds", func.__name__, execution_time)
         
         return result
     
     return wrapper
 
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide event loop, starting it on a daemon thread on first use
+    
+    Blocking work offloaded with asyncio.to_thread runs on the loop's default
+    executor, sized by the YMYL_THREAD_POOL_SIZE environment variable.
+    
+    Returns:
+        Running event loop shared by all sessions
+    """
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+                    max_workers=THREAD_POOL_SIZE,
+                    thread_name_prefix='ymyl-worker'
+                ))
+                threading.Thread(target=loop.run_forever, name='ymyl-event-loop', daemon=True).start()
+                _background_loop = loop
+    return _background_loop
+
+def run_async(coro: Awaitable[Any], timeout: Optional[float] = None,
+              on_poll: Optional[Callable[[float], None]] = None, poll_interval: float = 0.25) -> Any:
+    """
+    Run a coroutine on the shared background loop and wait for its result
+    
+    With on_poll, the wait is split into poll_interval slices and the callback
+    receives the elapsed seconds between them. A Streamlit call in the callback
+    lets the runtime interrupt the script (stop or rerun), and the coroutine
+    is then cancelled instead of running on unobserved.
+    
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds before TimeoutError is raised and the coroutine cancelled (None waits indefinitely)
+        on_poll: Optional callback invoked with the elapsed seconds while waiting
+        poll_interval: Seconds between on_poll calls
+        
+    Returns:
+        The coroutine's result
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    start = time.monotonic()
+    try:
+        if on_poll is None:
+            return future.result(timeout)
+        
+        while True:
+            try:
+                return future.result(poll_interval)
+            except concurrent.futures.TimeoutError:
+                # A TimeoutError raised by the coroutine itself propagates as-is
+                if future.done():
+                    raise
+                elapsed = time.monotonic() - start
+                if timeout is not None and elapsed >= timeout:
+                    raise
+                on_poll(elapsed)
+    finally:
+        if not future.done():
+            future.cancel()
+
 def create_safe_filename(text: str, max_length: int = 50) -> str:
     """
     Create safe filename from text
@@ -193,10 +347,9 @@ def create_safe_filename(text: str, max_length: int = 50) -> str:
     if not text:
         return "untitled"
     
-    # Remove/replace unsafe characters
-    safe_text = re.sub(r'[^\w\s-]', '', text)  # Keep alphanumeric, spaces, hyphens
-    safe_text = re.sub(r'\s+', '_', safe_text)  # Replace spaces with underscores
-    safe_text = safe_text.lower().strip('_')
+    # Keep word characters, whitespace and hyphens, then join whitespace runs with underscores
+    safe_text = ''.join(ch for ch in text if ch.isalnum() or ch in '_-' or ch.isspace())
+    safe_text = '_'.join(safe_text.split()).lower().strip('_')
     
     # Truncate if too long
     if len(safe_text) > max_length:
@@ -204,6 +357,7 @@ def create_safe_filename(text: str, max_length: int = 50) -> str:
     
     return safe_text or "untitled"
 
+@lru_cache(maxsize=1024)
 def extract_domain(url: str) -> Optional[str]:
     """
     Extract domain from URL
@@ -218,18 +372,8 @@ def extract_domain(url: str) -> Optional[str]:
         if not validate_url(url):
             return None
         
-        # Remove protocol
-        domain = re.sub(r'^https?://', '', url)
-        
-        # Remove path, query, fragment
-        domain = domain.split('/')[0]
-        domain = domain.split('?')[0]
-        domain = domain.split('#')[0]
-        
-        # Remove port
-        domain = domain.split(':')[0]
-        
-        return domain.lower()
+        # Host without port, already lowercased by urlsplit
+        return urlsplit(url.strip()).hostname
         
     except Exception:
         return None
@@ -246,14 +390,18 @@ def format_duration(seconds: float) -> str:
     """
     if seconds < 60:
         return f"{seconds:.1f}s"
-    elif seconds < 3600:
-        minutes = int(seconds // 60)
-        remaining_seconds = seconds % 60
-        return f"{minutes}m {remaining_seconds:.1f}s"
-    else:
-        hours = int(seconds // 3600)
-        remaining_minutes = int((seconds % 3600) // 60)
-        return f"{hours}h {remaining_minutes}m"
+    
+    minutes, remaining_seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{int(minutes)}m {remaining_seconds:.1f}s"
+    
+    hours, remaining_minutes = divmod(int(minutes), 60)
+    return f"{hours}h {remaining_minutes}m"
+
+@lru_cache(maxsize=256)
+def _split_key_path(key_path: str) -> Tuple[str, ...]:
+    """Split a dot-separated key path once per distinct path"""
+    return tuple(key_path.split('.'))
 
 def dict_get_nested(data: Dict, key_path: str, default: Any = None) -> Any:
     """
@@ -268,10 +416,9 @@ def dict_get_nested(data: Dict, key_path: str, default: Any = None) -> Any:
         Value at key path or default
     """
     try:
-        keys = key_path.split('.')
         value = data
         
-        for key in keys:
+        for key in _split_key_path(key_path):
             if isinstance(value, dict) and key in value:
                 value = value[key]
             else:
@@ -282,14 +429,14 @@ def dict_get_nested(data: Dict, key_path: str, default: Any = None) -> Any:
     except Exception:
         return default
 
+@lru_cache(maxsize=1)
 def is_development_mode() -> bool:
     """
-    Check if running in development mode
+    Check if running in development mode (environment read once per process)
     
     Returns:
         True if in development mode
     """
-    import os
     return os.environ.get('STREAMLIT_ENV', '').lower() == 'development'
 
 # Error handling utilities
@@ -303,17 +450,17 @@ class SafeExecutor:
         self.error = None
     
     def __enter__(self):
-        safe_log(f"Starting operation: {self.operation_name}")
+        safe_log("Starting operation: %s", self.operation_name, level="DEBUG")
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_type is None:
             self.success = True
-            safe_log(f"Operation completed successfully: {self.operation_name}")
+            safe_log("Operation completed successfully: %s", self.operation_name, level="DEBUG")
         else:
             self.success = False
             self.error = str(exc_val)
-            safe_log(f"Operation failed: {self.operation_name} - {exc_val}", "ERROR")
+            safe_log("Operation failed: %s - %s", self.operation_name, exc_val, level="ERROR")
             
             if self.reraise:
                 return False  # Re-raise the exception
@@ -338,11 +485,12 @@ def safe_execute(func, *args, operation_name: str = None, default_return=None, *
     op_name = operation_name or func.__name__
     
     try:
-        safe_log(f"Executing: {op_name}")
+        # Success-path tracing is DEBUG-only so wrapped hot calls don't pay for logging
+        safe_log("Executing: %s", op_name, level="DEBUG")
         result = func(*args, **kwargs)
-        safe_log(f"Success: {op_name}")
+        safe_log("Success: %s", op_name, level="DEBUG")
         return result
         
     except Exception as e:
-        safe_log(f"Error in {op_name}: {str(e)}", "ERROR")
+        safe_log("Error in %s: %s", op_name, e, level="ERROR")
         return default_return